@@ -1,4 +1,6 @@
-from netlify import __version__
+import sys
+
+from netlify.cli import main
 
 if __name__ == "__main__":
-    print(__version__)
+    sys.exit(main())
@@ -0,0 +1,375 @@
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from collections.abc import Generator, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import NamedTuple
+
+from netlify.exceptions import ArchiveFileChangedError
+
+# Formats that are already compressed gain nothing from deflate.
+STORED_EXTENSIONS = frozenset({
+    ".7z",
+    ".avif",
+    ".br",
+    ".gif",
+    ".gz",
+    ".heic",
+    ".jpeg",
+    ".jpg",
+    ".mp3",
+    ".mp4",
+    ".ogg",
+    ".png",
+    ".webm",
+    ".webp",
+    ".woff",
+    ".woff2",
+    ".zip",
+    ".zst",
+})
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_FILECOUNT_LIMIT = 0xFFFF
+
+# Placeholders written in fixed-width fields whose real value is in a ZIP64 record
+_ZIP64_SIZE = 0xFFFFFFFF
+_ZIP64_COUNT = 0xFFFF
+
+_LOCAL_FILE_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_DIRECTORY_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IHHHHIIH")
+_ZIP64_END_OF_CENTRAL_DIRECTORY = struct.Struct("<IQHHIIQQQQ")
+_ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = struct.Struct("<IIQI")
+_DATA_DESCRIPTOR = struct.Struct("<IIII")
+_ZIP64_DATA_DESCRIPTOR = struct.Struct("<IIQQ")
+
+_UTF8_FLAG = 0x800
+_DATA_DESCRIPTOR_FLAG = 0x8
+_VERSION = 20
+_ZIP64_VERSION = 45
+_UNIX_SYSTEM = 3
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class CompressedFile(NamedTuple):
+    method: int
+    crc: int
+    size: int
+    data: bytes
+    mode: int
+    mtime: float
+
+
+class _CentralDirectoryEntry(NamedTuple):
+    name: bytes
+    flags: int
+    method: int
+    crc: int
+    size: int
+    compressed_size: int
+    mode: int
+    mtime: float
+    offset: int
+
+
+def compress_file(path: str, level: int = 6) -> CompressedFile:
+    """
+    Read and deflate a single file. Runs in a worker process.
+    """
+    with open(path, "rb") as fd:
+        raw = fd.read()
+    stat = os.stat(path)
+
+    method, data = ZIP_STORED, raw
+    if os.path.splitext(path)[1].lower() not in STORED_EXTENSIONS:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(raw) + compressor.flush()
+        if len(deflated) < len(raw):
+            method, data = ZIP_DEFLATED, deflated
+
+    return CompressedFile(
+        method, zlib.crc32(raw), len(raw), data, stat.st_mode, stat.st_mtime
+    )
+
+
+def iter_zip_directory(
+    directory: str,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    max_buffered_bytes: int = 64 * 1024 * 1024,
+) -> Iterator[bytes]:
+    """
+    Yield a zip archive of directory chunk by chunk.
+
+    Files are compressed in parallel (on a process pool unless an executor is
+    given) while results for at most a small window of files, and roughly
+    max_buffered_bytes of file data, are held in memory, so the archive can be
+    streamed into a request body without a temporary file. Files that are
+    stored as-is, and files larger than max_buffered_bytes, skip the pool and
+    are read from disk once, in chunks, as they are written.
+    """
+    owns_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=max_workers)
+    window = 2 * (max_workers or os.cpu_count() or 1)
+    pending: deque[tuple[str, int, int, Future[CompressedFile] | None]] = deque()
+    buffered = 0
+    entries: list[_CentralDirectoryEntry] = []
+    offset = 0
+
+    try:
+        paths = _walk(directory)
+        next_path = next(paths, None)
+        while True:
+            while next_path is not None and len(pending) < window:
+                size = os.stat(next_path).st_size
+                if os.path.splitext(next_path)[1].lower() in STORED_EXTENSIONS:
+                    pending.append((next_path, ZIP_STORED, 0, None))
+                elif size > max_buffered_bytes:
+                    pending.append((next_path, ZIP_DEFLATED, 0, None))
+                else:
+                    if buffered > 0 and buffered + size > max_buffered_bytes:
+                        break
+                    buffered += size
+                    pending.append((
+                        next_path,
+                        ZIP_DEFLATED,
+                        size,
+                        pool.submit(compress_file, next_path),
+                    ))
+                next_path = next(paths, None)
+            if not pending:
+                break
+
+            path, method, size, future = pending.popleft()
+            buffered -= size
+            name = os.path.relpath(path, directory).replace(os.sep, "/").encode()
+
+            if future is None:
+                entry, length = yield from _stream_file(name, path, method, offset)
+            else:
+                file = future.result()
+                entry = _CentralDirectoryEntry(
+                    name,
+                    0,
+                    file.method,
+                    file.crc,
+                    file.size,
+                    len(file.data),
+                    file.mode,
+                    file.mtime,
+                    offset,
+                )
+                header = _local_file_header(entry)
+                yield header
+                yield file.data
+                length = len(header) + len(file.data)
+            entries.append(entry)
+            offset += length
+    finally:
+        if owns_executor:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    yield from _central_directory(entries, offset)
+
+
+def _stream_file(
+    name: bytes, path: str, method: int, offset: int, level: int = 6
+) -> Generator[bytes, None, tuple[_CentralDirectoryEntry, int]]:
+    """
+    Yield a local file header, the file's data and a data descriptor carrying
+    the CRC and sizes, which are only known once the whole file has been read.
+    Returns the entry for the central directory and the number of bytes
+    written.
+    """
+    stat = os.stat(path)
+    # Deflate can slightly expand incompressible data, so leave some headroom
+    # when deciding up front whether the sizes need 64 bits.
+    zip64 = stat.st_size * 1.05 >= ZIP64_LIMIT
+    compressor = (
+        zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        if method == ZIP_DEFLATED
+        else None
+    )
+
+    header = _local_file_header(
+        _CentralDirectoryEntry(
+            name,
+            _DATA_DESCRIPTOR_FLAG,
+            method,
+            0,
+            0,
+            0,
+            stat.st_mode,
+            stat.st_mtime,
+            offset,
+        ),
+        zip64=zip64,
+    )
+    yield header
+
+    crc = size = compressed_size = 0
+    for chunk in _iter_file_chunks(path):
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        data = compressor.compress(chunk) if compressor is not None else chunk
+        compressed_size += len(data)
+        yield data
+    if compressor is not None:
+        data = compressor.flush()
+        compressed_size += len(data)
+        yield data
+
+    if size != stat.st_size:
+        raise ArchiveFileChangedError(
+            f"{path} changed size from {stat.st_size} to {size} bytes while it "
+            "was being archived"
+        )
+
+    descriptor = (_ZIP64_DATA_DESCRIPTOR if zip64 else _DATA_DESCRIPTOR).pack(
+        0x08074B50, crc, compressed_size, size
+    )
+    yield descriptor
+
+    entry = _CentralDirectoryEntry(
+        name,
+        _DATA_DESCRIPTOR_FLAG,
+        method,
+        crc,
+        size,
+        compressed_size,
+        stat.st_mode,
+        stat.st_mtime,
+        offset,
+    )
+    return entry, len(header) + compressed_size + len(descriptor)
+
+
+def _iter_file_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as fd:
+        while chunk := fd.read(_CHUNK_SIZE):
+            yield chunk
+
+
+def _walk(directory: str) -> Iterator[str]:
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file in sorted(files):
+            yield os.path.join(root, file)
+
+
+def _local_file_header(entry: _CentralDirectoryEntry, zip64: bool = False) -> bytes:
+    extra = b""
+    compressed_size, size = entry.compressed_size, entry.size
+    if zip64 or compressed_size >= ZIP64_LIMIT or size >= ZIP64_LIMIT:
+        extra = struct.pack("<HHQQ", 1, 16, size, compressed_size)
+        compressed_size = size = _ZIP64_SIZE
+
+    dos_time, dos_date = _dos_datetime(entry.mtime)
+    return (
+        _LOCAL_FILE_HEADER.pack(
+            0x04034B50,
+            _ZIP64_VERSION if extra else _VERSION,
+            _UTF8_FLAG | entry.flags,
+            entry.method,
+            dos_time,
+            dos_date,
+            entry.crc,
+            compressed_size,
+            size,
+            len(entry.name),
+            len(extra),
+        )
+        + entry.name
+        + extra
+    )
+
+
+def _central_directory(
+    entries: list[_CentralDirectoryEntry], start: int
+) -> Iterator[bytes]:
+    size = 0
+    for entry in entries:
+        record = _central_directory_header(entry)
+        size += len(record)
+        yield record
+
+    count = len(entries)
+    if count >= ZIP_FILECOUNT_LIMIT or size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+        zip64_offset = start + size
+        yield _ZIP64_END_OF_CENTRAL_DIRECTORY.pack(
+            0x06064B50,
+            _ZIP64_END_OF_CENTRAL_DIRECTORY.size - 12,
+            _ZIP64_VERSION | _UNIX_SYSTEM << 8,
+            _ZIP64_VERSION,
+            0,
+            0,
+            count,
+            count,
+            size,
+            start,
+        )
+        yield _ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR.pack(
+            0x07064B50, 0, zip64_offset, 1
+        )
+        count, size, start = _ZIP64_COUNT, _ZIP64_SIZE, _ZIP64_SIZE
+
+    yield _END_OF_CENTRAL_DIRECTORY.pack(0x06054B50, 0, 0, count, count, size, start, 0)
+
+
+def _central_directory_header(entry: _CentralDirectoryEntry) -> bytes:
+    compressed_size, size, offset = entry.compressed_size, entry.size, entry.offset
+    zip64_fields: list[int] = []
+    if compressed_size >= ZIP64_LIMIT or size >= ZIP64_LIMIT:
+        zip64_fields += [size, compressed_size]
+        compressed_size = size = _ZIP64_SIZE
+    if offset >= ZIP64_LIMIT:
+        zip64_fields.append(offset)
+        offset = _ZIP64_SIZE
+
+    extra = b""
+    if zip64_fields:
+        extra = struct.pack(
+            f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields
+        )
+
+    version = _ZIP64_VERSION if extra else _VERSION
+    dos_time, dos_date = _dos_datetime(entry.mtime)
+    return (
+        _CENTRAL_DIRECTORY_HEADER.pack(
+            0x02014B50,
+            version | _UNIX_SYSTEM << 8,
+            version,
+            _UTF8_FLAG | entry.flags,
+            entry.method,
+            dos_time,
+            dos_date,
+            entry.crc,
+            compressed_size,
+            size,
+            len(entry.name),
+            len(extra),
+            0,
+            0,
+            0,
+            (entry.mode & 0xFFFF) << 16,
+            offset,
+        )
+        + entry.name
+        + extra
+    )
+
+
+def _dos_datetime(mtime: float) -> tuple[int, int]:
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (
+        hour << 11 | minute << 5 | second // 2,
+        (year - 1980) << 9 | month << 5 | day,
+    )
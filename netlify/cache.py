@@ -0,0 +1,82 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Protocol
+
+# Sentinel returned on a cache miss, since None is a valid cached response.
+MISS: Any = object()
+
+
+class ResponseCache(Protocol):
+    def get(self, key: str) -> Any: ...
+
+    def set(self, key: str, path: str, value: Any) -> None: ...
+
+    def invalidate(self, path: str) -> None: ...
+
+
+class SQLiteResponseCache:
+    """
+    Response cache stored in a SQLite database so that every process on a host
+    pointing at the same file shares cached GET responses.
+    """
+
+    path: str
+    ttl: float
+    timeout: float
+
+    def __init__(self, path: str, ttl: float = 30.0, timeout: float = 30.0):
+        self.path = path
+        self.ttl = ttl
+        self.timeout = timeout
+
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, path TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL"
+                ")"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_path ON responses (path)"
+            )
+
+    def get(self, key: str) -> Any:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return MISS
+        return json.loads(row[0])
+
+    def set(self, key: str, path: str, value: Any) -> None:
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, path, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, path, json.dumps(value), now + self.ttl),
+            )
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop cached responses for path, everything beneath it and each of its
+        ancestors, since a write to /sites/abc/deploys also changes what
+        /sites/abc and /sites return.
+        """
+        segments = [segment for segment in path.split("/") if segment]
+        paths = ["/" + "/".join(segments[:end]) for end in range(1, len(segments) + 1)]
+        prefix = f"{path.rstrip('/')}/"
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "DELETE FROM responses WHERE substr(path, 1, ?) = ? "
+                f"OR path IN ({', '.join('?' * (len(paths) + 1))})",
+                (len(prefix), prefix, path, *paths),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
@@ -0,0 +1,230 @@
+import argparse
+import datetime
+import json
+import os
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
+
+import pydantic
+
+from netlify import __version__
+from netlify.client import NetlifyClient
+from netlify.enums import ListSitesFilter
+from netlify.pydantic_polyfill import PydanticPolyfill
+from netlify.schemas import SiteDeploy
+from netlify.webhooks import DeployEventHub
+
+_output_lock = threading.Lock()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.handler is None:
+        print(__version__)
+        return 0
+
+    if not args.access_token:
+        parser.error(
+            "an access token is required (--access-token or NETLIFY_ACCESS_TOKEN)"
+        )
+
+    with NetlifyClient(args.access_token, base_url=args.base_url) as client:
+        handler: Callable[[NetlifyClient, argparse.Namespace], int] = args.handler
+        return handler(client, args)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="netlify-python",
+        description="Query and deploy Netlify sites, streaming results as JSON lines.",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    parser.add_argument(
+        "--access-token",
+        default=os.getenv("NETLIFY_ACCESS_TOKEN"),
+        help="Personal access token (default: $NETLIFY_ACCESS_TOKEN)",
+    )
+    parser.add_argument("--base-url", default="https://api.netlify.com/api/v1")
+    parser.add_argument(
+        "--concurrency",
+        type=_positive_int,
+        default=4,
+        help="Maximum number of requests in flight for multi-ID commands",
+    )
+    parser.set_defaults(handler=None)
+    commands = parser.add_subparsers(title="commands")
+
+    sites = commands.add_parser("sites").add_subparsers(title="commands", required=True)
+
+    sites_list = sites.add_parser("list")
+    sites_list.add_argument(
+        "--filter", choices=[f.value for f in ListSitesFilter], default=None
+    )
+    sites_list.add_argument("--per-page", type=_positive_int, default=100)
+    sites_list.set_defaults(handler=_sites_list)
+
+    sites_get = sites.add_parser("get")
+    sites_get.add_argument("site_ids", nargs="+", metavar="site_id")
+    sites_get.set_defaults(handler=_sites_get)
+
+    files = commands.add_parser("files").add_subparsers(title="commands", required=True)
+
+    files_list = files.add_parser("list")
+    files_list.add_argument("site_ids", nargs="+", metavar="site_id")
+    files_list.set_defaults(handler=_files_list)
+
+    deploy = commands.add_parser("deploy").add_subparsers(
+        title="commands", required=True
+    )
+
+    deploy_create = deploy.add_parser("create")
+    deploy_create.add_argument("site_id")
+    deploy_create.add_argument("path", help="Zip file or directory to deploy")
+    deploy_create.add_argument("--title", default=None)
+    deploy_create.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=None,
+        help="Processes used to compress a directory (default: CPU count)",
+    )
+    deploy_create.set_defaults(handler=_deploy_create)
+
+    deploy_wait = deploy.add_parser("wait")
+    deploy_wait.add_argument("site_id")
+    deploy_wait.add_argument("deploy_ids", nargs="+", metavar="deploy_id")
+    deploy_wait.add_argument("--interval", type=float, default=5.0)
+    deploy_wait.add_argument("--timeout", type=float, default=600.0)
+    deploy_wait.set_defaults(handler=_deploy_wait)
+
+    return parser
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return number
+
+
+def _sites_list(client: NetlifyClient, args: argparse.Namespace) -> int:
+    page = 1
+    try:
+        while True:
+            sites = client.list_sites(
+                filter=ListSitesFilter(args.filter) if args.filter else None,
+                page=page,
+                per_page=args.per_page,
+            )
+            for site in sites:
+                _emit(site)
+            if len(sites) < args.per_page:
+                return 0
+            page += 1
+    except Exception as err:
+        _emit_error(None, err)
+        return 1
+
+
+def _sites_get(client: NetlifyClient, args: argparse.Namespace) -> int:
+    return _emit_concurrently(args.site_ids, client.get_site, args.concurrency)
+
+
+def _files_list(client: NetlifyClient, args: argparse.Namespace) -> int:
+    return _emit_concurrently(args.site_ids, client.iter_site_files, args.concurrency)
+
+
+def _deploy_create(client: NetlifyClient, args: argparse.Namespace) -> int:
+    try:
+        if os.path.isdir(args.path):
+            deploy = client.create_site_deploy_from_directory(
+                args.site_id, args.path, title=args.title, max_workers=args.workers
+            )
+        else:
+            deploy = client.create_site_deploy(
+                args.site_id, args.path, title=args.title
+            )
+    except Exception as err:
+        _emit_error(args.site_id, err)
+        return 1
+    _emit(deploy)
+    return 0
+
+
+def _deploy_wait(client: NetlifyClient, args: argparse.Namespace) -> int:
+    # Nothing publishes to this hub, so waiting falls back to polling every
+    # interval seconds.
+    hub = DeployEventHub()
+
+    def wait(deploy_id: str) -> SiteDeploy:
+        return hub.wait_for_deploy(
+            client,
+            args.site_id,
+            deploy_id,
+            timeout=args.timeout,
+            quiet_period=args.interval,
+        )
+
+    return _emit_concurrently(args.deploy_ids, wait, args.concurrency)
+
+
+def _emit_concurrently(
+    ids: Iterable[str],
+    fetch: Callable[[str], pydantic.BaseModel | Iterable[pydantic.BaseModel]],
+    concurrency: int,
+) -> int:
+    """
+    Fetch each id on a thread pool, emitting results from the workers as they
+    are produced. Failures are reported on stderr without stopping the
+    remaining ids.
+    """
+
+    def fetch_and_emit(item_id: str) -> None:
+        for item in _as_iterable(fetch(item_id)):
+            _emit(item)
+
+    status = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(fetch_and_emit, item_id): item_id for item_id in ids}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as err:
+                status = 1
+                _emit_error(futures[future], err)
+    return status
+
+
+def _as_iterable(
+    result: pydantic.BaseModel | Iterable[pydantic.BaseModel],
+) -> Iterator[pydantic.BaseModel]:
+    if isinstance(result, pydantic.BaseModel):
+        yield result
+    else:
+        yield from result
+
+
+def _emit(model: pydantic.BaseModel) -> None:
+    data = PydanticPolyfill[pydantic.BaseModel].from_pydantic_object(model)
+    line = json.dumps(data, default=_json_default)
+    with _output_lock:
+        print(line, flush=True)
+
+
+def _emit_error(item_id: str | None, err: Exception) -> None:
+    line = json.dumps({"id": item_id, "error": type(err).__name__, "message": str(err)})
+    with _output_lock:
+        print(line, file=sys.stderr, flush=True)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
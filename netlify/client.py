@@ -1,5 +1,15 @@
-from netlify.enums import ListSitesFilter
+import os
+from collections.abc import Iterator
+from types import TracebackType
+
+from netlify.archive import iter_zip_directory
+from netlify.cache import ResponseCache
+from netlify.concurrency import ConcurrencyLimiter
+from netlify.enums import ListSitesFilter, RequestPriority
+from netlify.file_table import SiteFileTable
 from netlify.pydantic_polyfill import PydanticPolyfill
+from netlify.ratelimit import RateLimiter
+from netlify.scheduling import RequestScheduler
 from netlify.schemas import CreateSiteRequest, Site, SiteDeploy, SiteFile, User
 from netlify.transport import NetlifyTransport
 
@@ -15,20 +25,51 @@ class NetlifyClient:
         base_url: str = "https://api.netlify.com/api/v1",
         user_agent: str = CLIENT_USER_AGENT,
         timeout: float = 60.000,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
-        self._transport = NetlifyTransport(access_token, base_url, user_agent, timeout)
+        self._transport = NetlifyTransport(
+            access_token,
+            base_url,
+            user_agent,
+            timeout,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            concurrency_limiter=concurrency_limiter,
+            scheduler=scheduler,
+        )
+
+    def __enter__(self) -> "NetlifyClient":
+        return self
 
-    def get_current_user(self) -> User:
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the pooled connections held by this client.
+        """
+        self._transport.close()
+
+    def get_current_user(self, priority: RequestPriority | None = None) -> User:
         """
         GET /user
         """
-        response = self._transport.send("GET", "/user")
+        response = self._transport.send("GET", "/user", priority=priority)
         return PydanticPolyfill[User](User).to_pydantic_object(response)
 
     def create_site(
         self,
         create_site_request: CreateSiteRequest,
         configure_dns: bool | None = None,
+        priority: RequestPriority | None = None,
     ) -> Site:
         """
         POST /sites
@@ -40,6 +81,7 @@ class NetlifyClient:
             payload=PydanticPolyfill[CreateSiteRequest].from_pydantic_object(
                 create_site_request
             ),
+            priority=priority,
         )
         return PydanticPolyfill[Site](Site).to_pydantic_object(response)
 
@@ -48,6 +90,7 @@ class NetlifyClient:
         account_slug: str,
         create_site_request: CreateSiteRequest,
         configure_dns: bool | None = None,
+        priority: RequestPriority | None = None,
     ) -> Site:
         """
         POST /{account_slug}/sites
@@ -59,20 +102,23 @@ class NetlifyClient:
             payload=PydanticPolyfill[CreateSiteRequest].from_pydantic_object(
                 create_site_request
             ),
+            priority=priority,
         )
         return PydanticPolyfill[Site](Site).to_pydantic_object(response)
 
-    def delete_site(self, site_id: str) -> None:
+    def delete_site(
+        self, site_id: str, priority: RequestPriority | None = None
+    ) -> None:
         """
         DELETE /sites/{site_id}
         """
-        self._transport.send("DELETE", f"/sites/{site_id}")
+        self._transport.send("DELETE", f"/sites/{site_id}", priority=priority)
 
-    def get_site(self, site_id: str) -> Site:
+    def get_site(self, site_id: str, priority: RequestPriority | None = None) -> Site:
         """
         GET /sites/{site_id}
         """
-        response = self._transport.send("GET", f"/sites/{site_id}")
+        response = self._transport.send("GET", f"/sites/{site_id}", priority=priority)
         return PydanticPolyfill[Site](Site).to_pydantic_object(response)
 
     def list_sites(
@@ -80,6 +126,7 @@ class NetlifyClient:
         filter: ListSitesFilter | None = None,
         page: int | None = None,
         per_page: int | None = None,
+        priority: RequestPriority | None = None,
     ) -> list[Site]:
         """
         GET /sites
@@ -88,30 +135,67 @@ class NetlifyClient:
             "GET",
             "/sites",
             params={"filter": filter, "page": page, "per_page": per_page},
+            priority=priority,
         )
         return [
             PydanticPolyfill[Site](Site).to_pydantic_object(site) for site in response
         ]
 
-    def get_site_file_by_path_name(self, site_id: str, file_path: str) -> SiteFile:
+    def get_site_file_by_path_name(
+        self, site_id: str, file_path: str, priority: RequestPriority | None = None
+    ) -> SiteFile:
         """
         GET /sites/{site_id}/files/{file_path}
         """
-        response = self._transport.send("GET", f"/sites/{site_id}/files/{file_path}")
+        response = self._transport.send(
+            "GET", f"/sites/{site_id}/files/{file_path}", priority=priority
+        )
         return PydanticPolyfill[SiteFile](SiteFile).to_pydantic_object(response)
 
-    def list_site_files(self, site_id: str) -> list[SiteFile]:
+    def list_site_files(
+        self, site_id: str, priority: RequestPriority | None = None
+    ) -> list[SiteFile]:
         """
         GET /sites/{site_id}/files
         """
-        response = self._transport.send("GET", f"/sites/{site_id}/files")
+        response = self._transport.send(
+            "GET", f"/sites/{site_id}/files", priority=priority
+        )
         return [
             PydanticPolyfill[SiteFile](SiteFile).to_pydantic_object(site_file)
             for site_file in response
         ]
 
+    def iter_site_files(
+        self, site_id: str, priority: RequestPriority | None = None
+    ) -> Iterator[SiteFile]:
+        """
+        GET /sites/{site_id}/files
+
+        Streams the response, yielding each file as it is parsed so memory
+        use stays flat regardless of how many files the site has.
+        """
+        for site_file in self._transport.stream(
+            "GET", f"/sites/{site_id}/files", priority=priority
+        ):
+            yield PydanticPolyfill[SiteFile](SiteFile).to_pydantic_object(site_file)
+
+    def list_site_files_table(
+        self, site_id: str, priority: RequestPriority | None = None
+    ) -> SiteFileTable:
+        """
+        GET /sites/{site_id}/files
+
+        Streams the response into a compact, column-oriented SiteFileTable.
+        """
+        return SiteFileTable.from_site_files(self.iter_site_files(site_id, priority))
+
     def create_site_deploy(
-        self, site_id: str, zip_file_path: str, title: str | None = None
+        self,
+        site_id: str,
+        zip_file_path: str,
+        title: str | None = None,
+        priority: RequestPriority | None = None,
     ) -> SiteDeploy:
         """
         POST /sites/{site_id}/deploys
@@ -125,12 +209,44 @@ class NetlifyClient:
             headers={"Content-Type": "application/zip"},
             params={"title": title},
             content=file_bytes,
+            priority=priority,
+        )
+        return PydanticPolyfill[SiteDeploy](SiteDeploy).to_pydantic_object(response)
+
+    def create_site_deploy_from_directory(
+        self,
+        site_id: str,
+        directory: str,
+        title: str | None = None,
+        max_workers: int | None = None,
+        priority: RequestPriority | None = None,
+    ) -> SiteDeploy:
+        """
+        POST /sites/{site_id}/deploys
+
+        Zips directory on the fly, compressing files in parallel across up to
+        max_workers processes and streaming the archive as the request body.
+        """
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"Not a directory: '{directory}'")
+
+        response = self._transport.send(
+            "POST",
+            f"/sites/{site_id}/deploys",
+            headers={"Content-Type": "application/zip"},
+            params={"title": title},
+            content=iter_zip_directory(directory, max_workers=max_workers),
+            priority=priority,
         )
         return PydanticPolyfill[SiteDeploy](SiteDeploy).to_pydantic_object(response)
 
-    def get_site_deploy(self, site_id: str, deploy_id: str) -> SiteDeploy:
+    def get_site_deploy(
+        self, site_id: str, deploy_id: str, priority: RequestPriority | None = None
+    ) -> SiteDeploy:
         """
         GET /sites/{site_id}/deploys/{deploy_id}
         """
-        response = self._transport.send("GET", f"/sites/{site_id}/deploys/{deploy_id}")
+        response = self._transport.send(
+            "GET", f"/sites/{site_id}/deploys/{deploy_id}", priority=priority
+        )
         return PydanticPolyfill[SiteDeploy](SiteDeploy).to_pydantic_object(response)
@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Protocol
+
+DEFAULT_FAMILY = "default"
+
+
+class ConcurrencyLimiter(Protocol):
+    def acquire(self, family: str) -> None: ...
+
+    def release(self, family: str, latency: float | None, congested: bool) -> None: ...
+
+
+class FamilyMetrics(NamedTuple):
+    limit: int
+    in_flight: int
+    requests: int
+    throttled: int
+    p50: float | None
+    p90: float | None
+    p99: float | None
+
+
+def endpoint_family(path: str) -> str:
+    """
+    Group API paths so that endpoints with similar cost and rate limits share
+    one concurrency limit: "sites", "files", "deploys" or "default".
+    """
+    segments = [segment for segment in path.split("/") if segment]
+    if segments[:1] == ["sites"]:
+        if len(segments) >= 3 and segments[2] in ("files", "deploys"):
+            return segments[2]
+        return "sites"
+    if segments[1:2] == ["sites"]:
+        return "sites"
+    return DEFAULT_FAMILY
+
+
+class _FamilyState:
+    limit: float
+    in_flight: int
+    requests: int
+    throttled: int
+    latencies: deque[float]
+    last_decrease: float
+
+    def __init__(self, limit: float, window: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.latencies = deque(maxlen=window)
+        self.last_decrease = 0.0
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease limit on in-flight requests,
+    tracked separately for each endpoint family.
+
+    The limit grows by roughly one per limit's worth of successful requests
+    while the family is saturated, and is cut by backoff on a 429, a
+    transport error such as a timeout or refused connection, or a response
+    slower than latency_tolerance times the recent median. Cuts happen at most
+    once per median latency so that one burst of congestion is only counted
+    once.
+    """
+
+    initial_limit: int
+    min_limit: int
+    max_limit: int
+    latency_tolerance: float
+    backoff: float
+    window: int
+    min_samples: int
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.window = window
+        self.min_samples = min_samples
+        self._condition = threading.Condition()
+        self._families: dict[str, _FamilyState] = {}
+
+    def acquire(self, family: str) -> None:
+        with self._condition:
+            state = self._state(family)
+            while state.in_flight >= int(state.limit):
+                self._condition.wait()
+            state.in_flight += 1
+
+    def release(self, family: str, latency: float | None, congested: bool) -> None:
+        with self._condition:
+            state = self._state(family)
+            saturated = state.in_flight >= int(state.limit)
+            state.in_flight -= 1
+            state.requests += 1
+
+            median = state.percentile(0.5)
+            slow = (
+                latency is not None
+                and median is not None
+                and len(state.latencies) >= self.min_samples
+                and latency > median * self.latency_tolerance
+            )
+            if latency is not None:
+                state.latencies.append(latency)
+            if congested:
+                state.throttled += 1
+
+            now = time.monotonic()
+            if congested or slow:
+                if now - state.last_decrease >= (median or 0.0):
+                    state.limit = max(self.min_limit, state.limit * self.backoff)
+                    state.last_decrease = now
+            elif saturated:
+                state.limit = min(self.max_limit, state.limit + 1 / state.limit)
+
+            self._condition.notify_all()
+
+    def limit(self, family: str) -> int:
+        with self._condition:
+            return int(self._state(family).limit)
+
+    def metrics(self) -> dict[str, FamilyMetrics]:
+        with self._condition:
+            return {
+                family: FamilyMetrics(
+                    limit=int(state.limit),
+                    in_flight=state.in_flight,
+                    requests=state.requests,
+                    throttled=state.throttled,
+                    p50=state.percentile(0.5),
+                    p90=state.percentile(0.9),
+                    p99=state.percentile(0.99),
+                )
+                for family, state in self._families.items()
+            }
+
+    def _state(self, family: str) -> _FamilyState:
+        state = self._families.get(family)
+        if state is None:
+            state = _FamilyState(self.initial_limit, self.window)
+            self._families[family] = state
+        return state
@@ -5,3 +5,9 @@ class ListSitesFilter(str, Enum):
     all = "all"
     owner = "owner"
     guest = "guest"
+
+
+class RequestPriority(int, Enum):
+    high = 0
+    normal = 1
+    low = 2
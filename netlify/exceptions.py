@@ -37,5 +37,29 @@ class NetlifyError(Exception):
         )
 
 
+class NetlifyWebhookError(Exception):
+    """
+    Raised when an incoming webhook's signature cannot be verified.
+    """
+
+
+class DeployWaitTimeoutError(Exception):
+    """
+    Raised when a deploy does not reach a terminal state before the timeout.
+    """
+
+
+class ArchiveFileChangedError(Exception):
+    """
+    Raised when a file changes while it is being streamed into a deploy archive.
+    """
+
+
+class NetlifyQueueTimeoutError(Exception):
+    """
+    Raised when a request waits in the scheduler queue past its deadline.
+    """
+
+
 # Backwards compatibility
 NetlifyException = NetlifyError
@@ -0,0 +1,146 @@
+from array import array
+from collections.abc import Iterable, Iterator, KeysView
+from typing import NamedTuple
+
+from netlify.schemas import SiteFile
+
+SHA1_SIZE = 20
+
+
+class SiteFileDiff(NamedTuple):
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+
+class SiteFileTable:
+    """
+    Column-oriented store for large site file listings.
+
+    Paths map to a row number; SHA1s are packed as 20-byte binary values,
+    sizes live in a signed 64-bit array, and the highly repetitive
+    mime_type/site_id/deploy_id values are stored once in a string table and
+    referenced by index. Ids are only stored when they differ from the path.
+    """
+
+    _rows: dict[str, int]
+    _ids: dict[int, str]
+    _shas: bytearray
+    _sizes: "array[int]"
+    _mime_types: "array[int]"
+    _site_ids: "array[int]"
+    _deploy_ids: "array[int]"
+    _strings: list[str | None]
+    _string_index: dict[str | None, int]
+
+    def __init__(self) -> None:
+        self._rows = {}
+        self._ids = {}
+        self._shas = bytearray()
+        self._sizes = array("q")
+        self._mime_types = array("L")
+        self._site_ids = array("L")
+        self._deploy_ids = array("L")
+        self._strings = []
+        self._string_index = {}
+
+    @classmethod
+    def from_site_files(cls, site_files: Iterable[SiteFile]) -> "SiteFileTable":
+        table = cls()
+        for site_file in site_files:
+            table.append(site_file)
+        return table
+
+    def append(self, site_file: SiteFile) -> None:
+        """
+        Add a file to the table, replacing any existing row for the same path.
+        """
+        sha = bytes.fromhex(site_file.sha)
+        if len(sha) != SHA1_SIZE:
+            raise ValueError(f"Expected a SHA1 hex digest, got {site_file.sha!r}")
+
+        row = self._rows.get(site_file.path)
+        if row is None:
+            row = len(self._rows)
+            self._rows[site_file.path] = row
+            self._shas += sha
+            self._sizes.append(site_file.size)
+            self._mime_types.append(self._intern(site_file.mime_type))
+            self._site_ids.append(self._intern(site_file.site_id))
+            self._deploy_ids.append(self._intern(site_file.deploy_id))
+        else:
+            self._shas[row * SHA1_SIZE : (row + 1) * SHA1_SIZE] = sha
+            self._sizes[row] = site_file.size
+            self._mime_types[row] = self._intern(site_file.mime_type)
+            self._site_ids[row] = self._intern(site_file.site_id)
+            self._deploy_ids[row] = self._intern(site_file.deploy_id)
+
+        if site_file.id != site_file.path:
+            self._ids[row] = site_file.id
+        else:
+            self._ids.pop(row, None)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._rows
+
+    def __iter__(self) -> Iterator[SiteFile]:
+        for path, row in self._rows.items():
+            yield self._build_site_file(path, row)
+
+    def __getitem__(self, path: str) -> SiteFile:
+        return self._build_site_file(path, self._rows[path])
+
+    def get(self, path: str) -> SiteFile | None:
+        row = self._rows.get(path)
+        if row is None:
+            return None
+        return self._build_site_file(path, row)
+
+    def paths(self) -> KeysView[str]:
+        """
+        Set-like view of all paths in the table.
+        """
+        return self._rows.keys()
+
+    def sha(self, path: str) -> str:
+        return self._sha_bytes(self._rows[path]).hex()
+
+    def diff(self, other: "SiteFileTable") -> SiteFileDiff:
+        """
+        Compare this listing against another by path and content hash.
+        """
+        changed = [
+            path
+            for path in self.paths() & other.paths()
+            if self._sha_bytes(self._rows[path]) != other._sha_bytes(other._rows[path])
+        ]
+        return SiteFileDiff(
+            added=sorted(other.paths() - self.paths()),
+            removed=sorted(self.paths() - other.paths()),
+            changed=sorted(changed),
+        )
+
+    def _sha_bytes(self, row: int) -> bytes:
+        return bytes(self._shas[row * SHA1_SIZE : (row + 1) * SHA1_SIZE])
+
+    def _intern(self, value: str | None) -> int:
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_index[value] = index
+        return index
+
+    def _build_site_file(self, path: str, row: int) -> SiteFile:
+        return SiteFile(
+            id=self._ids.get(row, path),
+            path=path,
+            sha=self._sha_bytes(row).hex(),
+            mime_type=self._strings[self._mime_types[row]] or "",
+            size=self._sizes[row],
+            site_id=self._strings[self._site_ids[row]],
+            deploy_id=self._strings[self._deploy_ids[row]],
+        )
@@ -0,0 +1,87 @@
+import sqlite3
+import time
+from contextlib import closing
+from typing import Protocol
+
+
+class RateLimiter(Protocol):
+    def acquire(self) -> None: ...
+
+
+class SQLiteTokenBucket:
+    """
+    Token bucket stored in a SQLite database so that every process on a host
+    pointing at the same file draws from one shared budget.
+    """
+
+    path: str
+    rate: float
+    capacity: float
+    name: str
+    timeout: float
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        capacity: float,
+        name: str = "default",
+        timeout: float = 30.0,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self.timeout = timeout
+
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL"
+                ")"
+            )
+
+    def acquire(self) -> None:
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _try_acquire(self) -> float:
+        """
+        Take one token if available, otherwise return seconds until one will be.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.name,),
+            ).fetchone()
+            if row is None:
+                tokens = self.capacity
+            else:
+                tokens = min(self.capacity, row[0] + (now - row[1]) * self.rate)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+
+            connection.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            connection.execute("COMMIT")
+            return wait
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Protocol
+
+from netlify.enums import RequestPriority
+from netlify.exceptions import NetlifyQueueTimeoutError
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    "netlify_request_priority", default=RequestPriority.normal
+)
+
+
+class RequestScheduler(Protocol):
+    def acquire(self, priority: RequestPriority) -> None: ...
+
+    def release(self) -> None: ...
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """
+    Send every request made inside the block with the given priority.
+
+    The priority is held in a ContextVar, which threads started by a
+    ThreadPoolExecutor do not inherit. Pass priority= to the client method, or
+    submit work through contextvars.copy_context().run, to carry it over.
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> RequestPriority:
+    return _current_priority.get()
+
+
+class _Ticket:
+    deadline: float | None
+    granted: bool
+    expired: bool
+
+    def __init__(self, deadline: float | None):
+        self.deadline = deadline
+        self.granted = False
+        self.expired = False
+
+
+class PriorityScheduler:
+    """
+    Admits requests into a shared pool of max_in_flight slots by priority.
+
+    High priority requests may use every slot, while normal and low priority
+    requests are limited to the slots left after reserved_high. Normal and low
+    share those slots by weighted round robin (normal_weight normal requests
+    per low request) so that bulk work still progresses. A request that waits
+    longer than its priority's queue timeout is dropped with
+    NetlifyQueueTimeoutError.
+
+    A slot covers a request's round trip up to the response headers; streamed
+    bodies are read after the slot has been released.
+    """
+
+    max_in_flight: int
+    reserved_high: int
+    normal_weight: int
+    queue_timeouts: Mapping[RequestPriority, float | None]
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        reserved_high: int = 2,
+        normal_weight: int = 4,
+        queue_timeouts: Mapping[RequestPriority, float | None] | None = None,
+    ):
+        if not 0 <= reserved_high < max_in_flight:
+            raise ValueError("Expected 0 <= reserved_high < max_in_flight")
+        if normal_weight < 1:
+            raise ValueError("normal_weight must be at least 1")
+
+        self.max_in_flight = max_in_flight
+        self.reserved_high = reserved_high
+        self.normal_weight = normal_weight
+        self.queue_timeouts = (
+            queue_timeouts
+            if queue_timeouts is not None
+            else {RequestPriority.low: 30.0}
+        )
+        self._condition = threading.Condition()
+        self._queues: dict[RequestPriority, deque[_Ticket]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self._in_flight = 0
+        self._normal_streak = 0
+
+    def acquire(self, priority: RequestPriority) -> None:
+        timeout = self.queue_timeouts.get(priority)
+        ticket = _Ticket(None if timeout is None else time.monotonic() + timeout)
+
+        with self._condition:
+            self._queues[priority].append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                if ticket.expired or (
+                    ticket.deadline is not None and time.monotonic() >= ticket.deadline
+                ):
+                    if not ticket.expired:
+                        self._queues[priority].remove(ticket)
+                    raise NetlifyQueueTimeoutError(
+                        f"{priority.name} priority request waited more than "
+                        f"{timeout} seconds for a slot"
+                    )
+                self._condition.wait(
+                    None
+                    if ticket.deadline is None
+                    else ticket.deadline - time.monotonic()
+                )
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def queued(self) -> dict[RequestPriority, int]:
+        with self._condition:
+            return {priority: len(queue) for priority, queue in self._queues.items()}
+
+    def in_flight(self) -> int:
+        with self._condition:
+            return self._in_flight
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for queue in self._queues.values():
+            while queue and queue[0].deadline is not None and queue[0].deadline <= now:
+                queue.popleft().expired = True
+
+        while True:
+            ticket = self._next_ticket()
+            if ticket is None:
+                break
+            ticket.granted = True
+            self._in_flight += 1
+        self._condition.notify_all()
+
+    def _next_ticket(self) -> _Ticket | None:
+        if self._in_flight >= self.max_in_flight:
+            return None
+        high = self._queues[RequestPriority.high]
+        if high:
+            return high.popleft()
+        if self._in_flight >= self.max_in_flight - self.reserved_high:
+            return None
+
+        normal = self._queues[RequestPriority.normal]
+        low = self._queues[RequestPriority.low]
+        if normal and (not low or self._normal_streak < self.normal_weight):
+            self._normal_streak += 1
+            return normal.popleft()
+        if low:
+            self._normal_streak = 0
+            return low.popleft()
+        return None
@@ -0,0 +1,105 @@
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+_NUMBER_CHARS = "0123456789+-.eE"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally parse a top-level JSON array, yielding each element as soon
+    as it is complete. Only the unparsed tail of the input is kept in memory.
+    """
+
+    _buffer: str
+    _started: bool
+    _finished: bool
+    _expect: str
+
+    def __init__(self) -> None:
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+        self._finished = False
+        # One of "value_or_end" (after "["), "value" (after ",") or "comma_or_end"
+        self._expect = "value_or_end"
+
+    def feed(self, data: bytes, final: bool = False) -> Iterator[Any]:
+        buffer = self._buffer + self._text_decoder.decode(data, final)
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == len(buffer):
+                break
+
+            char = buffer[position]
+            if self._finished:
+                raise json.JSONDecodeError("Extra data", buffer, position)
+            if not self._started:
+                if char != "[":
+                    raise json.JSONDecodeError("Expecting '['", buffer, position)
+                self._started = True
+                position += 1
+            elif self._expect == "comma_or_end":
+                if char not in ",]":
+                    raise json.JSONDecodeError("Expecting ',' or ']'", buffer, position)
+                self._finished = char == "]"
+                self._expect = "value"
+                position += 1
+            elif self._expect == "value_or_end" and char == "]":
+                self._finished = True
+                position += 1
+            else:
+                try:
+                    value, end = self._json_decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as err:
+                    if final or not _is_truncated(buffer, err):
+                        raise
+                    break
+                # A number cut off by a chunk boundary still decodes (e.g. "-6."
+                # as -6), so only accept a value once its delimiter has arrived.
+                # Anything other than the rest of a number is already an error.
+                if not final and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                    if buffer[end:].lstrip(_NUMBER_CHARS):
+                        raise json.JSONDecodeError("Expecting ',' or ']'", buffer, end)
+                    break
+                yield value
+                position = end
+                self._expect = "comma_or_end"
+
+        self._buffer = buffer[position:]
+        if final and not self._finished:
+            raise json.JSONDecodeError("Unterminated array", buffer, len(buffer))
+
+
+def _is_truncated(buffer: str, err: json.JSONDecodeError) -> bool:
+    """
+    Whether a decode error may be caused by the input ending part way through a
+    value, rather than by invalid JSON that no further input can fix.
+    """
+    tail = buffer[err.pos :]
+    if err.pos == len(buffer) or err.msg.startswith("Unterminated string"):
+        return True
+    # A nested number cut off mid-fraction or mid-exponent decodes up to the
+    # cut ("1." as 1) and then fails on the characters that follow it.
+    if buffer[err.pos - 1] in _NUMBER_CHARS and not tail.lstrip(_NUMBER_CHARS):
+        return True
+    if err.msg.startswith("Invalid \\uXXXX escape"):
+        return '"' not in tail
+    return err.msg == "Expecting value" and any(
+        literal.startswith(tail) for literal in _LITERALS
+    )
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    parser = JSONArrayStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.feed(b"", final=True)
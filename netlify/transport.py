@@ -1,29 +1,83 @@
+import hashlib
+import json
 import logging
-from collections.abc import Iterable, Mapping, Sequence
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from enum import Enum
+from types import NoneType
 from typing import Any
 
 import httpx
 
 from netlify.auth.bearer import BearerAuth
+from netlify.cache import MISS, ResponseCache
+from netlify.concurrency import ConcurrencyLimiter, endpoint_family
+from netlify.enums import RequestPriority
 from netlify.exceptions import NetlifyError, NetlifyErrorSchema
 from netlify.pydantic_polyfill import PydanticPolyfill
+from netlify.ratelimit import RateLimiter
+from netlify.scheduling import RequestScheduler, current_priority
+from netlify.streaming import iter_json_array
 
 logger = logging.getLogger(__name__)
 
 
+class _RequestSlot:
+    """
+    Outcome of a request, reported back to the concurrency limiter.
+    """
+
+    started: float
+    latency: float | None
+    congested: bool
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.latency = None
+        self.congested = False
+
+    def observe(self, response: httpx.Response, timed: bool = True) -> None:
+        if timed:
+            self.latency = time.monotonic() - self.started
+        self.congested = response.status_code == httpx.codes.TOO_MANY_REQUESTS
+
+
 class NetlifyTransport:
     _auth: BearerAuth
     _default_base_url: str
     _default_timeout: int | float
     _default_headers: dict[str, str]
+    _rate_limiter: RateLimiter | None
+    _concurrency_limiter: ConcurrencyLimiter | None
+    _scheduler: RequestScheduler | None
+    _cache: ResponseCache | None
+    _client: httpx.Client | None
+    _client_lock: threading.Lock
 
     def __init__(
-        self, access_token: str, base_url: str, user_agent: str, timeout: int | float
+        self,
+        access_token: str,
+        base_url: str,
+        user_agent: str,
+        timeout: int | float,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        concurrency_limiter: ConcurrencyLimiter | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
         self._auth = BearerAuth(access_token)
         self._default_base_url = base_url
         self._default_timeout = timeout
         self._default_headers = {"User-Agent": user_agent}
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self._scheduler = scheduler
+        self._cache = cache
+        self._client = None
+        self._client_lock = threading.Lock()
 
     def send(
         self,
@@ -48,54 +102,192 @@ class NetlifyTransport:
         headers: dict[str, str] | None = None,
         timeout: int | float | None = None,
         base_url: str | None = None,
+        priority: RequestPriority | None = None,
         **kwargs: dict[str, Any],
     ) -> Any:
-        with httpx.Client(
-            base_url=self._build_base_url(base_url),
-            auth=self._auth,
+        params = self._build_params(params)
+
+        cache_key = None
+        # Deploy state changes without any request from this client, and is
+        # polled while waiting for a deploy, so it is never served from cache.
+        if (
+            self._cache is not None
+            and method == "GET"
+            and endpoint_family(path) != "deploys"
+        ):
+            cache_key = self._build_cache_key(base_url, path, params)
+            cached = self._cache.get(cache_key)
+            if cached is not MISS:
+                logger.debug(f"Cached response for {method} {path}")
+                return cached
+
+        with self._request_slot(path, priority) as slot:
+            response = self._get_client().request(
+                method,
+                self._build_url(base_url, path),
+                content=content,
+                data=None,
+                files=files,
+                json=payload,
+                auth=self._auth,
+                params=params,
+                cookies=None,
+                headers=self._build_headers(headers),
+                follow_redirects=False,
+                timeout=self._build_timeout(timeout),
+                extensions=None,
+                **kwargs,
+            )
+            # Uploading a streamed body such as a zipped directory takes as
+            # long as producing it, which says nothing about endpoint load.
+            slot.observe(response, timed=isinstance(content, (str, bytes, NoneType)))
+
+        logger.debug(f"Response from netlify: {response}")
+        self._raise_for_status(method, path, response)
+
+        if self._cache is not None and method != "GET":
+            for invalidated_path in self._build_invalidated_paths(path):
+                self._cache.invalidate(invalidated_path)
+
+        if response.status_code == httpx.codes.NO_CONTENT:
+            return None
+
+        result = response.json()
+        if self._cache is not None and cache_key is not None:
+            self._cache.set(cache_key, path, result)
+        return result
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: int | float | None = None,
+        base_url: str | None = None,
+        priority: RequestPriority | None = None,
+    ) -> Iterator[Any]:
+        """
+        Send a request whose response is a JSON array and yield its elements
+        as they are parsed from the response stream. Streamed responses are
+        never cached.
+        """
+        httpx_client = self._get_client()
+        request = httpx_client.build_request(
+            method,
+            self._build_url(base_url, path),
+            params=self._build_params(params),
             headers=self._build_headers(headers),
             timeout=self._build_timeout(timeout),
-        ) as httpx_client:
+        )
+        # Only the round trip up to the response headers holds a slot, so a
+        # caller may make further requests while consuming the body.
+        with self._request_slot(path, priority) as slot:
+            response = httpx_client.send(
+                request, auth=self._auth, stream=True, follow_redirects=False
+            )
+            slot.observe(response)
+
+        try:
+            logger.debug(f"Response from netlify: {response}")
+            if response.is_error:
+                response.read()
+                self._raise_for_status(method, path, response)
+
+            yield from iter_json_array(response.iter_bytes())
+        finally:
+            response.close()
+
+    @contextmanager
+    def _request_slot(
+        self, path: str, priority: RequestPriority | None
+    ) -> Iterator[_RequestSlot]:
+        """
+        Wait for a scheduler slot, a concurrency slot and a rate limit token,
+        then time the request made inside the block. Without an explicit
+        priority the one set by request_priority() is used.
+        """
+        family = endpoint_family(path)
+        if self._scheduler is not None:
+            self._scheduler.acquire(
+                priority if priority is not None else current_priority()
+            )
+        try:
+            if self._concurrency_limiter is not None:
+                self._concurrency_limiter.acquire(family)
+            slot = _RequestSlot()
             try:
-                if params is not None:
-                    params = {
-                        key: value
-                        for (key, value) in params.items()
-                        if value is not None
-                    }
-
-                response = httpx_client.request(
-                    method,
-                    path,
-                    content=content,
-                    data=None,
-                    files=files,
-                    json=payload,
-                    auth=self._auth,
-                    params=params,
-                    cookies=None,
-                    headers=None,
-                    follow_redirects=False,
-                    timeout=None,
-                    extensions=None,
-                    **kwargs,
-                )
+                if self._rate_limiter is not None:
+                    self._rate_limiter.acquire()
+                    slot.started = time.monotonic()
+                try:
+                    yield slot
+                except httpx.TransportError:
+                    slot.congested = True
+                    raise
+            finally:
+                if self._concurrency_limiter is not None:
+                    self._concurrency_limiter.release(
+                        family, slot.latency, slot.congested
+                    )
+        finally:
+            if self._scheduler is not None:
+                self._scheduler.release()
+
+    def _raise_for_status(
+        self, method: str, path: str, response: httpx.Response
+    ) -> None:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as http_err:
+            if "application/json" in response.headers.get("content-type", ""):
+                error = PydanticPolyfill[NetlifyErrorSchema](
+                    NetlifyErrorSchema
+                ).to_pydantic_object(response.json())
+                raise NetlifyError(method, path, error) from http_err
 
-                logger.debug(f"Response from netlify: {response}")
-                response.raise_for_status()
+            raise http_err
 
-                if response.status_code == httpx.codes.NO_CONTENT:
-                    return None
+    def close(self) -> None:
+        """
+        Close the pooled connections held by this transport.
+        """
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def _get_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    auth=self._auth, limits=self._build_limits()
+                )
+            return self._client
 
-                return response.json()
-            except httpx.HTTPStatusError as http_err:
-                if "application/json" in response.headers.get("content-type", ""):
-                    error = PydanticPolyfill[NetlifyErrorSchema](
-                        NetlifyErrorSchema
-                    ).to_pydantic_object(response.json())
-                    raise NetlifyError(method, path, error) from http_err
+    def _build_limits(self) -> httpx.Limits:
+        # A streamed body keeps its connection after its scheduler slot is
+        # released, so a connection limit would let bulk streams make high
+        # priority requests queue in httpx's pool, out of the scheduler's
+        # reach. With a scheduler, admission is left entirely to it.
+        if self._scheduler is not None:
+            return httpx.Limits(max_connections=None, max_keepalive_connections=20)
+        return httpx.Limits(max_connections=100, max_keepalive_connections=20)
 
-                raise http_err
+    def _build_url(self, base_url_input: str | None, path: str) -> str:
+        return f"{self._build_base_url(base_url_input).rstrip('/')}/{path.lstrip('/')}"
+
+    def _build_params(
+        self, params_input: Mapping[str, Any] | None
+    ) -> dict[str, Any] | None:
+        if params_input is None:
+            return None
+        return {
+            key: value.value if isinstance(value, Enum) else value
+            for (key, value) in params_input.items()
+            if value is not None
+        }
 
     def _build_headers(self, headers_input: dict[str, str] | None) -> dict[str, str]:
         if headers_input is None:
@@ -111,3 +303,25 @@ class NetlifyTransport:
         if base_url_input is None:
             return self._default_base_url
         return base_url_input
+
+    def _build_invalidated_paths(self, path: str) -> list[str]:
+        # Sites created or changed under /{account_slug}/sites also appear in
+        # /sites.
+        segments = [segment for segment in path.split("/") if segment]
+        if segments[1:2] == ["sites"]:
+            return [path, "/" + "/".join(segments[1:])]
+        return [path]
+
+    def _build_cache_key(
+        self, base_url_input: str | None, path: str, params: Mapping[str, Any] | None
+    ) -> str:
+        key = json.dumps(
+            [
+                self._auth.bearer_token,
+                self._build_base_url(base_url_input),
+                path,
+                sorted((params or {}).items()),
+            ],
+            default=str,
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
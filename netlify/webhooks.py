@@ -0,0 +1,313 @@
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from typing import Any
+
+from netlify.client import NetlifyClient
+from netlify.exceptions import DeployWaitTimeoutError, NetlifyWebhookError
+from netlify.pydantic_polyfill import PydanticPolyfill
+from netlify.schemas import SiteDeploy
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+TERMINAL_DEPLOY_STATES = ("ready", "error", "rejected")
+
+DeploySubscriber = Callable[[SiteDeploy], None]
+
+logger = logging.getLogger(__name__)
+
+
+def verify_webhook_signature(body: bytes, signature: str | None, secret: str) -> None:
+    """
+    Verify the JWS that Netlify sends in the X-Webhook-Signature header: an
+    HS256 token signed with the webhook secret whose claims carry the issuer
+    and the SHA256 of the request body.
+    """
+    if not signature:
+        raise NetlifyWebhookError("Missing webhook signature")
+
+    parts = signature.split(".")
+    if len(parts) != 3:
+        raise NetlifyWebhookError("Malformed webhook signature")
+    header_segment, claims_segment, signature_segment = parts
+
+    try:
+        header = json.loads(_b64url_decode(header_segment))
+        claims = json.loads(_b64url_decode(claims_segment))
+        provided = _b64url_decode(signature_segment)
+    except ValueError as err:
+        raise NetlifyWebhookError("Malformed webhook signature") from err
+
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise NetlifyWebhookError("Unsupported webhook signature algorithm")
+
+    expected = hmac.new(
+        secret.encode("utf-8"),
+        f"{header_segment}.{claims_segment}".encode("ascii"),
+        hashlib.sha256,
+    ).digest()
+    if not hmac.compare_digest(provided, expected):
+        raise NetlifyWebhookError("Invalid webhook signature")
+
+    if not isinstance(claims, dict) or claims.get("iss") != "netlify":
+        raise NetlifyWebhookError("Invalid webhook issuer")
+    if not hmac.compare_digest(
+        str(claims.get("sha256", "")).encode("utf-8"),
+        hashlib.sha256(body).hexdigest().encode("ascii"),
+    ):
+        raise NetlifyWebhookError("Webhook body does not match signature")
+
+
+def parse_deploy_event(body: bytes) -> SiteDeploy:
+    return PydanticPolyfill[SiteDeploy](SiteDeploy).to_pydantic_object(json.loads(body))
+
+
+class DeployEventHub:
+    """
+    Tracks the latest known state of deploys and fans out updates to
+    subscribers and to threads blocked in wait_for_deploy.
+    """
+
+    _condition: threading.Condition
+    _deploys: "OrderedDict[str, tuple[SiteDeploy, float]]"
+    _subscribers: list[DeploySubscriber]
+    max_tracked: int
+
+    def __init__(self, max_tracked: int = 10_000):
+        self._condition = threading.Condition()
+        self._deploys = OrderedDict()
+        self._subscribers = []
+        self.max_tracked = max_tracked
+
+    def subscribe(self, subscriber: DeploySubscriber) -> Callable[[], None]:
+        """
+        Call subscriber for every published deploy. Returns an unsubscribe
+        function.
+        """
+        with self._condition:
+            self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            with self._condition:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    def publish(self, deploy: SiteDeploy) -> None:
+        """
+        Record deploy and notify subscribers and waiters. Notifications that
+        arrive out of order are dropped: a deploy that has reached a terminal
+        state never goes back, and an update older than the known one (by
+        updated_at) is ignored.
+        """
+        with self._condition:
+            if self._is_stale(deploy):
+                logger.debug(f"Ignoring out of order update for deploy {deploy.id}")
+                return
+            self._store(deploy)
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+
+        # A failing subscriber must not stop the others or fail the webhook
+        # request that delivered the event.
+        for subscriber in subscribers:
+            try:
+                subscriber(deploy)
+            except Exception:
+                logger.exception(f"Deploy subscriber failed for {deploy.id}")
+
+    def get(self, deploy_id: str) -> SiteDeploy | None:
+        with self._condition:
+            entry = self._deploys.get(deploy_id)
+        return entry[0] if entry is not None else None
+
+    def wait_for_deploy(
+        self,
+        client: NetlifyClient,
+        site_id: str,
+        deploy_id: str,
+        timeout: float = 600.0,
+        quiet_period: float = 60.0,
+    ) -> SiteDeploy:
+        """
+        Block until the deploy reaches a terminal state. Published events wake
+        the waiter immediately; the API is only polled when nothing has been
+        heard about the deploy for quiet_period seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while True:
+                    deploy, updated_at = self._deploys.get(deploy_id, (None, 0.0))
+                    if deploy is not None and deploy.state in TERMINAL_DEPLOY_STATES:
+                        return deploy
+
+                    now = time.monotonic()
+                    if now >= deadline:
+                        raise DeployWaitTimeoutError(
+                            f"Deploy {deploy_id} still "
+                            f"{deploy.state if deploy else 'unknown'} "
+                            f"after {timeout} seconds"
+                        )
+                    if deploy is None or now - updated_at >= quiet_period:
+                        break
+                    self._condition.wait(min(deadline, updated_at + quiet_period) - now)
+
+            polled = client.get_site_deploy(site_id, deploy_id)
+            if deploy is None or polled.state != deploy.state:
+                self.publish(polled)
+            else:
+                with self._condition:
+                    self._store(polled)
+
+    def _is_stale(self, deploy: SiteDeploy) -> bool:
+        entry = self._deploys.get(deploy.id)
+        if entry is None:
+            return False
+        known = entry[0]
+        if (
+            known.state in TERMINAL_DEPLOY_STATES
+            and deploy.state not in TERMINAL_DEPLOY_STATES
+        ):
+            return True
+        return (
+            known.updated_at is not None
+            and deploy.updated_at is not None
+            and deploy.updated_at < known.updated_at
+        )
+
+    def _store(self, deploy: SiteDeploy) -> None:
+        self._deploys[deploy.id] = (deploy, time.monotonic())
+        self._deploys.move_to_end(deploy.id)
+        while len(self._deploys) > self.max_tracked:
+            self._deploys.popitem(last=False)
+
+
+def make_wsgi_app(
+    hub: DeployEventHub, secret: str, max_body_bytes: int = 1024 * 1024
+) -> Callable[..., Iterable[bytes]]:
+    """
+    Build a WSGI application that accepts Netlify deploy notifications and
+    publishes them to hub. Bodies over max_body_bytes are refused with a 413
+    before they are read.
+    """
+
+    def app(
+        environ: dict[str, Any], start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        try:
+            content_length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            content_length = -1
+
+        if environ["REQUEST_METHOD"] != "POST":
+            status, message = 405, b"Method Not Allowed"
+        elif content_length < 0:
+            status, message = 400, b"Bad Request"
+        elif content_length > max_body_bytes:
+            status, message = 413, b"Content Too Large"
+        else:
+            body = environ["wsgi.input"].read(content_length)
+            status, message = _handle_webhook(
+                hub, secret, body, environ.get("HTTP_X_WEBHOOK_SIGNATURE")
+            )
+
+        start_response(
+            f"{status} {message.decode('ascii')}",
+            [
+                ("Content-Type", "text/plain"),
+                ("Content-Length", str(len(message))),
+            ],
+        )
+        return [message]
+
+    return app
+
+
+def make_asgi_app(
+    hub: DeployEventHub, secret: str, max_body_bytes: int = 1024 * 1024
+) -> Callable[..., Coroutine[Any, Any, None]]:
+    """
+    Build an ASGI application that accepts Netlify deploy notifications and
+    publishes them to hub. Reading stops with a 413 as soon as the body grows
+    past max_body_bytes.
+    """
+
+    async def app(
+        scope: dict[str, Any],
+        receive: Callable[[], Awaitable[dict[str, Any]]],
+        send: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                event = await receive()
+                if event["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                else:
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] == "websocket":
+            await receive()
+            await send({"type": "websocket.close"})
+            return
+
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+        if scope["method"] != "POST":
+            status, message = 405, b"Method Not Allowed"
+        else:
+            body = b""
+            more_body = True
+            while more_body and len(body) <= max_body_bytes:
+                event = await receive()
+                body += event.get("body", b"")
+                more_body = event.get("more_body", False)
+
+            if len(body) > max_body_bytes:
+                status, message = 413, b"Content Too Large"
+            else:
+                headers = dict(scope["headers"])
+                signature = headers.get(SIGNATURE_HEADER.lower().encode("ascii"))
+                status, message = _handle_webhook(
+                    hub,
+                    secret,
+                    body,
+                    signature.decode("latin-1") if signature else None,
+                )
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"text/plain")],
+        })
+        await send({"type": "http.response.body", "body": message})
+
+    return app
+
+
+def _handle_webhook(
+    hub: DeployEventHub, secret: str, body: bytes, signature: str | None
+) -> tuple[int, bytes]:
+    try:
+        verify_webhook_signature(body, signature, secret)
+    except NetlifyWebhookError:
+        return 401, b"Unauthorized"
+
+    try:
+        deploy = parse_deploy_event(body)
+    except ValueError:
+        return 400, b"Bad Request"
+
+    hub.publish(deploy)
+    return 200, b"OK"
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
@@ -0,0 +1,164 @@
+import io
+import os
+import zipfile
+from collections.abc import Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from netlify import archive as archive_module
+from netlify.archive import (
+    ZIP_DEFLATED,
+    ZIP_STORED,
+    compress_file,
+    iter_zip_directory,
+)
+from netlify.exceptions import ArchiveFileChangedError
+
+
+@pytest.fixture
+def site_dir(tmp_path: Path) -> Generator[Path, None, None]:
+    (tmp_path / "index.html").write_text("<html>hello</html>" * 100)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "logo.png").write_bytes(b"\x89PNG" + bytes(range(256)))
+    (tmp_path / "assets" / "tiny.txt").write_bytes(b"x")
+    (tmp_path / "assets" / "ünïcode.css").write_text("body {}" * 10)
+    os.utime(tmp_path / "assets" / "tiny.txt", (0, 0))
+    yield tmp_path
+
+
+def read_zip(site_dir: Path) -> zipfile.ZipFile:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        data = b"".join(iter_zip_directory(str(site_dir), executor=executor))
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    return archive
+
+
+def test_compress_file(site_dir: Path) -> None:
+    html = compress_file(str(site_dir / "index.html"))
+    png = compress_file(str(site_dir / "assets" / "logo.png"))
+    tiny = compress_file(str(site_dir / "assets" / "tiny.txt"))
+
+    assert html.method == ZIP_DEFLATED
+    assert len(html.data) < html.size
+    assert png.method == ZIP_STORED
+    assert tiny.method == ZIP_STORED
+    assert tiny.data == b"x"
+
+
+def test_iter_zip_directory(site_dir: Path) -> None:
+    archive = read_zip(site_dir)
+
+    assert archive.namelist() == [
+        "index.html",
+        "assets/logo.png",
+        "assets/tiny.txt",
+        "assets/ünïcode.css",
+    ]
+    assert archive.read("index.html") == (site_dir / "index.html").read_bytes()
+    assert archive.getinfo("index.html").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.getinfo("assets/logo.png").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("assets/tiny.txt").date_time == (1980, 1, 1, 0, 0, 0)
+
+
+def test_iter_zip_directory_process_pool(site_dir: Path) -> None:
+    data = b"".join(iter_zip_directory(str(site_dir), max_workers=1))
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.read("assets/tiny.txt") == b"x"
+
+
+def test_iter_zip_directory_empty(tmp_path: Path) -> None:
+    assert (
+        zipfile.ZipFile(
+            io.BytesIO(b"".join(iter_zip_directory(str(tmp_path))))
+        ).namelist()
+        == []
+    )
+
+
+def test_iter_zip_directory_zip64(site_dir: Path, mocker: MockerFixture) -> None:
+    mocker.patch("netlify.archive.ZIP64_LIMIT", 100)
+    mocker.patch("netlify.archive.ZIP_FILECOUNT_LIMIT", 2)
+
+    archive = read_zip(site_dir)
+
+    assert len(archive.namelist()) == 4
+    assert archive.read("index.html") == (site_dir / "index.html").read_bytes()
+    assert archive.getinfo("assets/tiny.txt").header_offset > 100
+
+
+def test_iter_zip_directory_streams_stored_files(
+    site_dir: Path, mocker: MockerFixture
+) -> None:
+    mocker.patch("netlify.archive._CHUNK_SIZE", 16)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        submit = mocker.spy(executor, "submit")
+        chunks = list(iter_zip_directory(str(site_dir), executor=executor))
+
+    assert [call.args[1] for call in submit.call_args_list] == [
+        str(site_dir / "index.html"),
+        str(site_dir / "assets" / "tiny.txt"),
+        str(site_dir / "assets" / "ünïcode.css"),
+    ]
+    assert b"\x89PNG" + bytes(range(12)) in chunks
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert archive.read("assets/logo.png") == b"\x89PNG" + bytes(range(256))
+
+
+def test_iter_zip_directory_max_buffered_bytes(
+    site_dir: Path, mocker: MockerFixture
+) -> None:
+    html_size = (site_dir / "index.html").stat().st_size
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        submit = mocker.spy(executor, "submit")
+        chunks = iter_zip_directory(
+            str(site_dir),
+            max_workers=8,
+            executor=executor,
+            max_buffered_bytes=html_size,
+        )
+
+        first = next(chunks)
+        assert submit.call_count == 1
+
+        data = first + b"".join(chunks)
+
+    assert submit.call_count == 3
+    assert zipfile.ZipFile(io.BytesIO(data)).testzip() is None
+
+
+def test_iter_zip_directory_streams_large_files(
+    site_dir: Path, mocker: MockerFixture
+) -> None:
+    mocker.patch("netlify.archive._CHUNK_SIZE", 16)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        submit = mocker.spy(executor, "submit")
+        data = b"".join(
+            iter_zip_directory(str(site_dir), executor=executor, max_buffered_bytes=100)
+        )
+
+    assert str(site_dir / "index.html") not in [
+        call.args[1] for call in submit.call_args_list
+    ]
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    assert archive.getinfo("index.html").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.read("index.html") == (site_dir / "index.html").read_bytes()
+
+
+def test_iter_zip_directory_file_changed(site_dir: Path, mocker: MockerFixture) -> None:
+    iter_file_chunks = archive_module._iter_file_chunks
+
+    def grow(path: str) -> Iterator[bytes]:
+        yield from iter_file_chunks(path)
+        yield b"appended"
+
+    mocker.patch("netlify.archive._iter_file_chunks", side_effect=grow)
+
+    with pytest.raises(ArchiveFileChangedError, match=r"logo\.png"):
+        read_zip(site_dir)
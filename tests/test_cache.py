@@ -0,0 +1,70 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from netlify.cache import MISS, SQLiteResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Generator[SQLiteResponseCache, None, None]:
+    yield SQLiteResponseCache(str(tmp_path / "netlify.sqlite"), ttl=10)
+
+
+def test_cache_get_set(cache: SQLiteResponseCache) -> None:
+    assert cache.get("key") is MISS
+
+    cache.set("key", "/sites", [{"id": "abc"}])
+
+    assert cache.get("key") == [{"id": "abc"}]
+
+
+def test_cache_shared_between_instances(tmp_path: Path) -> None:
+    first = SQLiteResponseCache(str(tmp_path / "netlify.sqlite"))
+    second = SQLiteResponseCache(str(tmp_path / "netlify.sqlite"))
+
+    first.set("key", "/user", {"id": "abc"})
+
+    assert second.get("key") == {"id": "abc"}
+
+
+def test_cache_expires(cache: SQLiteResponseCache, mocker: MockerFixture) -> None:
+    clock = mocker.patch("netlify.cache.time.time", return_value=1000.0)
+    cache.set("key", "/user", {"id": "abc"})
+
+    clock.return_value = 1009.0
+    assert cache.get("key") == {"id": "abc"}
+
+    clock.return_value = 1010.0
+    assert cache.get("key") is MISS
+
+
+def test_cache_invalidate(cache: SQLiteResponseCache) -> None:
+    cache.set("site", "/sites/abc", {"id": "abc"})
+    cache.set("files", "/sites/abc/files", [])
+    cache.set("similar", "/sites/abcdef", {"id": "abcdef"})
+    cache.set("sites", "/sites", [])
+    cache.set("user", "/user", {"id": "me"})
+
+    cache.invalidate("/sites/abc")
+
+    assert cache.get("site") is MISS
+    assert cache.get("files") is MISS
+    assert cache.get("similar") == {"id": "abcdef"}
+    assert cache.get("sites") is MISS
+    assert cache.get("user") == {"id": "me"}
+
+
+def test_cache_invalidate_ancestors(cache: SQLiteResponseCache) -> None:
+    cache.set("sites", "/sites", [])
+    cache.set("site", "/sites/abc", {"id": "abc"})
+    cache.set("files", "/sites/abc/files", [])
+    cache.set("other", "/sites/def", {"id": "def"})
+
+    cache.invalidate("/sites/abc/deploys")
+
+    assert cache.get("sites") is MISS
+    assert cache.get("site") is MISS
+    assert cache.get("files") == []
+    assert cache.get("other") == {"id": "def"}
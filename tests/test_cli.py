@@ -0,0 +1,218 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from netlify import __version__
+from netlify.cli import _json_default, main
+from tests.conftest import fixture_from_file
+
+BASE_URL = "https://api.netlify.com/api/v1"
+SITE_ID = "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.fixture(autouse=True)
+def access_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NETLIFY_ACCESS_TOKEN", "access-token")
+
+
+@pytest.fixture
+def read_lines(capsys: pytest.CaptureFixture[str]) -> Callable[[], list[Any]]:
+    def read_lines() -> list[Any]:
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    return read_lines
+
+
+def test_cli_prints_version(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main([]) == 0
+    assert capsys.readouterr().out == f"{__version__}\n"
+
+
+def test_cli_requires_access_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("NETLIFY_ACCESS_TOKEN")
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(["sites", "get", SITE_ID])
+
+    assert excinfo.value.code == 2
+
+
+def test_cli_sites_list_pages(
+    httpx_mock: HTTPXMock, read_lines: Callable[[], list[Any]]
+) -> None:
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/sites?filter=owner&page=1&per_page=1",
+        content=fixture_from_file("list_sites_response.json"),
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/sites?filter=owner&page=2&per_page=1", json=[]
+    )
+
+    assert main(["sites", "list", "--filter", "owner", "--per-page", "1"]) == 0
+
+    lines = read_lines()
+    assert [line["id"] for line in lines] == [SITE_ID]
+    assert lines[0]["created_at"].startswith("20")
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["sites", "list", "--per-page", "0"],
+        ["sites", "list", "--per-page", "-1"],
+        ["--concurrency", "0", "sites", "get", SITE_ID],
+        ["deploy", "create", SITE_ID, "site.zip", "--workers", "abc"],
+    ],
+)
+def test_cli_rejects_non_positive_ints(
+    argv: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+
+    assert excinfo.value.code == 2
+    assert "expected a positive integer" in capsys.readouterr().err
+
+
+def test_cli_sites_list_reports_errors(
+    httpx_mock: HTTPXMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    httpx_mock.add_response(status_code=401, json={"code": 401, "message": "Nope"})
+
+    assert main(["sites", "list"]) == 1
+
+    error = json.loads(capsys.readouterr().err)
+    assert error["id"] is None
+    assert error["error"] == "NetlifyError"
+
+
+def test_cli_sites_get_reports_errors(
+    httpx_mock: HTTPXMock,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/sites/{SITE_ID}",
+        content=fixture_from_file("site_response.json"),
+    )
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/sites/missing",
+        status_code=404,
+        json={"code": 404, "message": "Not Found"},
+    )
+
+    assert main(["--concurrency", "2", "sites", "get", SITE_ID, "missing"]) == 1
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["id"] == SITE_ID
+    error = json.loads(captured.err)
+    assert error["id"] == "missing"
+    assert error["error"] == "NetlifyError"
+
+
+def test_cli_files_list(
+    httpx_mock: HTTPXMock, read_lines: Callable[[], list[Any]]
+) -> None:
+    httpx_mock.add_response(
+        url=f"{BASE_URL}/sites/{SITE_ID}/files",
+        content=fixture_from_file("list_site_files_response.json"),
+    )
+
+    assert main(["files", "list", SITE_ID]) == 0
+
+    assert [line["path"] for line in read_lines()] == ["/index.html", "/other.html"]
+
+
+def test_cli_deploy_create_zip(
+    httpx_mock: HTTPXMock, read_lines: Callable[[], list[Any]]
+) -> None:
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}/sites/{SITE_ID}/deploys?title=release",
+        content=fixture_from_file("site_deploy_response.json"),
+    )
+
+    assert (
+        main([
+            "deploy",
+            "create",
+            SITE_ID,
+            "./tests/fixtures/test_site.zip",
+            "--title",
+            "release",
+        ])
+        == 0
+    )
+
+    assert read_lines()[0]["id"] == "abcdef0123456789"
+
+
+def test_cli_deploy_create_directory(
+    httpx_mock: HTTPXMock, read_lines: Callable[[], list[Any]], tmp_path: Path
+) -> None:
+    (tmp_path / "index.html").write_text("<html></html>")
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{BASE_URL}/sites/{SITE_ID}/deploys",
+        content=fixture_from_file("site_deploy_response.json"),
+    )
+
+    assert main(["deploy", "create", SITE_ID, str(tmp_path)]) == 0
+
+    assert read_lines()[0]["id"] == "abcdef0123456789"
+    assert httpx_mock.get_request().content[:2] == b"PK"  # type: ignore[union-attr]
+
+
+def test_cli_deploy_create_reports_errors(
+    capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    assert main(["deploy", "create", SITE_ID, str(tmp_path / "missing.zip")]) == 1
+
+    error = json.loads(capsys.readouterr().err)
+    assert error["id"] == SITE_ID
+    assert error["error"] == "FileNotFoundError"
+
+
+def test_cli_deploy_wait(
+    httpx_mock: HTTPXMock, read_lines: Callable[[], list[Any]]
+) -> None:
+    deploy = json.loads(fixture_from_file("site_deploy_response.json"))
+    httpx_mock.add_response(json={**deploy, "state": "building"})
+    httpx_mock.add_response(json=deploy)
+
+    assert (
+        main(["deploy", "wait", SITE_ID, "abcdef0123456789", "--interval", "0.01"]) == 0
+    )
+
+    assert read_lines()[0]["state"] == "ready"
+
+
+def test_cli_deploy_wait_timeout(
+    httpx_mock: HTTPXMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    deploy = json.loads(fixture_from_file("site_deploy_response.json"))
+    httpx_mock.add_response(json={**deploy, "state": "building"})
+
+    assert (
+        main([
+            "deploy",
+            "wait",
+            SITE_ID,
+            "abcdef0123456789",
+            "--interval",
+            "2",
+            "--timeout",
+            "0.01",
+        ])
+        == 1
+    )
+
+    assert json.loads(capsys.readouterr().err)["error"] == "DeployWaitTimeoutError"
+
+
+def test_cli_json_default() -> None:
+    with pytest.raises(TypeError):
+        _json_default(object())
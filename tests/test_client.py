@@ -1,10 +1,15 @@
+import io
+import zipfile
 from collections.abc import Callable, Generator
+from pathlib import Path
 
 import pytest
 from pytest_httpx import HTTPXMock
+from pytest_mock import MockerFixture
 
 from netlify import __version__
 from netlify.client import CLIENT_USER_AGENT, NetlifyClient
+from netlify.enums import ListSitesFilter, RequestPriority
 from netlify.schemas import (
     CreateSiteRequest,
 )
@@ -97,6 +102,28 @@ def test_get_site(
     assert result.account_name == "Marty McFly's team"
 
 
+@pytest.mark.parametrize("json_fixture", ["list_site_files_response"], indirect=True)
+def test_client_request_priority(
+    json_fixture: bytes,
+    set_mock_response: Callable[..., None],
+    mocker: MockerFixture,
+) -> None:
+    scheduler = mocker.Mock()
+    client = NetlifyClient("access-token", scheduler=scheduler)
+    set_mock_response(json_fixture)
+    set_mock_response(json_fixture)
+
+    client.list_site_files_table(
+        "11111111-1111-1111-1111-111111111111", priority=RequestPriority.low
+    )
+    client.list_site_files("11111111-1111-1111-1111-111111111111")
+
+    assert [call.args[0] for call in scheduler.acquire.call_args_list] == [
+        RequestPriority.low,
+        RequestPriority.normal,
+    ]
+
+
 @pytest.mark.parametrize("json_fixture", ["list_sites_response"], indirect=True)
 def test_list_sites(
     json_fixture: bytes,
@@ -193,3 +220,82 @@ def test_get_site_deploy(
 
     assert result.id == "abcdef0123456789"
     assert result.site_id == "11111111-1111-1111-1111-111111111111"
+
+
+@pytest.mark.parametrize("json_fixture", ["list_sites_response"], indirect=True)
+def test_list_sites__filter(
+    json_fixture: bytes,
+    client: NetlifyClient,
+    httpx_mock: HTTPXMock,
+) -> None:
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites?filter=owner&per_page=10",
+        content=json_fixture,
+    )
+
+    result = client.list_sites(filter=ListSitesFilter.owner, per_page=10)
+
+    assert len(result) == 1
+
+
+@pytest.mark.parametrize("json_fixture", ["list_site_files_response"], indirect=True)
+def test_iter_site_files(
+    json_fixture: bytes,
+    client: NetlifyClient,
+    set_mock_response: Callable[..., None],
+) -> None:
+    set_mock_response(json_fixture)
+
+    result = client.iter_site_files("11111111-1111-1111-1111-111111111111")
+
+    assert [site_file.sha for site_file in result] == [
+        "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+        "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb",
+    ]
+
+
+@pytest.mark.parametrize("json_fixture", ["list_site_files_response"], indirect=True)
+def test_list_site_files_table(
+    json_fixture: bytes,
+    client: NetlifyClient,
+    set_mock_response: Callable[..., None],
+) -> None:
+    set_mock_response(json_fixture)
+
+    result = client.list_site_files_table("11111111-1111-1111-1111-111111111111")
+
+    assert len(result) == 2
+    assert result.sha("/other.html") == "bbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbbb"
+
+
+@pytest.mark.parametrize("json_fixture", ["site_deploy_response"], indirect=True)
+def test_create_site_deploy_from_directory(
+    json_fixture: bytes,
+    client: NetlifyClient,
+    httpx_mock: HTTPXMock,
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "index.html").write_text("<html></html>")
+    httpx_mock.add_response(content=json_fixture)
+
+    result = client.create_site_deploy_from_directory(
+        "11111111-1111-1111-1111-111111111111", str(tmp_path), max_workers=1
+    )
+
+    assert result.id == "abcdef0123456789"
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Content-Type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(request.content))
+    assert archive.read("index.html") == b"<html></html>"
+
+
+def test_create_site_deploy_from_directory__not_a_directory(
+    client: NetlifyClient,
+) -> None:
+    with pytest.raises(NotADirectoryError) as excinfo:
+        client.create_site_deploy_from_directory(
+            "11111111-1111-1111-1111-111111111111", "./tests/fixtures/test_site.zip"
+        )
+
+    assert "tests/fixtures/test_site.zip" in str(excinfo.value)
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections.abc import Generator
+
+import pytest
+
+from netlify.concurrency import AdaptiveConcurrencyLimiter, endpoint_family
+
+
+@pytest.fixture
+def limiter() -> Generator[AdaptiveConcurrencyLimiter, None, None]:
+    yield AdaptiveConcurrencyLimiter(
+        initial_limit=2, max_limit=4, min_samples=3, window=10
+    )
+
+
+@pytest.mark.parametrize(
+    ("path", "family"),
+    [
+        ("/sites", "sites"),
+        ("/sites/abc", "sites"),
+        ("/my-team/sites", "sites"),
+        ("/sites/abc/files", "files"),
+        ("/sites/abc/files/deploys/index.html", "files"),
+        ("/sites/abc/deploys/def", "deploys"),
+        ("/user", "default"),
+        ("/", "default"),
+    ],
+)
+def test_endpoint_family(path: str, family: str) -> None:
+    assert endpoint_family(path) == family
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"min_limit": 0},
+        {"initial_limit": 100},
+        {"backoff": 1.0},
+    ],
+)
+def test_limiter_invalid_arguments(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(**kwargs)  # type: ignore[arg-type]
+
+
+def test_limiter_increases_while_saturated(
+    limiter: AdaptiveConcurrencyLimiter,
+) -> None:
+    for _ in range(20):
+        in_flight = limiter.limit("sites")
+        for _ in range(in_flight):
+            limiter.acquire("sites")
+        for _ in range(in_flight):
+            limiter.release("sites", 0.1, congested=False)
+
+    assert limiter.limit("sites") == 4
+    assert limiter.limit("files") == 2
+
+
+def test_limiter_does_not_increase_when_idle(
+    limiter: AdaptiveConcurrencyLimiter,
+) -> None:
+    for _ in range(20):
+        limiter.acquire("sites")
+        limiter.release("sites", 0.1, congested=False)
+
+    assert limiter.limit("sites") == 2
+
+
+def test_limiter_backs_off_on_throttling(limiter: AdaptiveConcurrencyLimiter) -> None:
+    limiter.acquire("files")
+    limiter.release("files", None, congested=True)
+
+    assert limiter.limit("files") == 1
+
+    limiter.acquire("files")
+    limiter.release("files", None, congested=True)
+
+    assert limiter.limit("files") == 1
+    assert limiter.metrics()["files"].throttled == 2
+
+
+def test_limiter_backs_off_on_latency(limiter: AdaptiveConcurrencyLimiter) -> None:
+    for latency in (0.1, 0.1, 0.1, 0.1):
+        limiter.acquire("deploys")
+        limiter.release("deploys", latency, congested=False)
+
+    limiter.acquire("deploys")
+    limiter.release("deploys", 1.0, congested=False)
+
+    assert limiter.limit("deploys") == 1
+
+
+def test_limiter_decreases_once_per_latency_interval() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8, min_samples=1)
+    limiter.acquire("sites")
+    limiter.release("sites", 10.0, congested=False)
+
+    limiter.acquire("sites")
+    limiter.release("sites", None, congested=True)
+    limiter.acquire("sites")
+    limiter.release("sites", None, congested=True)
+
+    assert limiter.limit("sites") == 4
+
+
+def test_limiter_blocks_at_limit(limiter: AdaptiveConcurrencyLimiter) -> None:
+    limiter.acquire("sites")
+    limiter.acquire("sites")
+    acquired = threading.Event()
+
+    def acquire() -> None:
+        limiter.acquire("sites")
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+
+    limiter.release("sites", 0.1, congested=False)
+    thread.join(timeout=1)
+    assert acquired.is_set()
+
+
+def test_limiter_metrics(limiter: AdaptiveConcurrencyLimiter) -> None:
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        limiter.acquire("sites")
+        limiter.release("sites", latency, congested=False)
+    limiter.acquire("sites")
+    limiter.limit("files")
+
+    metrics = limiter.metrics()
+
+    assert metrics["sites"].limit == 2
+    assert metrics["sites"].in_flight == 1
+    assert metrics["sites"].requests == 4
+    assert metrics["sites"].throttled == 0
+    assert metrics["sites"].p50 == 0.3
+    assert metrics["sites"].p90 == 0.4
+    assert metrics["sites"].p99 == 0.4
+    assert metrics["files"].p50 is None
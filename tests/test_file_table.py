@@ -0,0 +1,82 @@
+from collections.abc import Generator
+
+import pytest
+
+from netlify.file_table import SiteFileDiff, SiteFileTable
+from netlify.schemas import SiteFile
+
+
+def site_file(path: str, sha: str, size: int = 10, **kwargs: str) -> SiteFile:
+    return SiteFile(
+        id=kwargs.get("id", path),
+        path=path,
+        sha=sha * 40,
+        mime_type=kwargs.get("mime_type", "text/html"),
+        size=size,
+        site_id="site",
+        deploy_id=kwargs.get("deploy_id"),
+    )
+
+
+@pytest.fixture
+def table() -> Generator[SiteFileTable, None, None]:
+    yield SiteFileTable.from_site_files([
+        site_file("/index.html", "a", deploy_id="deploy"),
+        site_file("/style.css", "b", size=20, mime_type="text/css"),
+        site_file("/about.html", "c", id="about"),
+    ])
+
+
+def test_file_table_lookup(table: SiteFileTable) -> None:
+    assert len(table) == 3
+    assert "/style.css" in table
+    assert "/missing" not in table
+    assert table.get("/missing") is None
+    assert table.sha("/style.css") == "b" * 40
+
+    assert table["/index.html"] == site_file("/index.html", "a", deploy_id="deploy")
+    assert table.get("/about.html") == site_file("/about.html", "c", id="about")
+
+    with pytest.raises(KeyError):
+        table["/missing"]
+
+
+def test_file_table_iterates_in_insertion_order(table: SiteFileTable) -> None:
+    assert [f.path for f in table] == ["/index.html", "/style.css", "/about.html"]
+    assert list(table.paths()) == ["/index.html", "/style.css", "/about.html"]
+    assert table["/style.css"].mime_type == "text/css"
+    assert table["/style.css"].size == 20
+
+
+def test_file_table_interns_strings(table: SiteFileTable) -> None:
+    assert table._strings == ["text/html", "site", "deploy", "text/css", None]
+
+
+def test_file_table_replaces_existing_path(table: SiteFileTable) -> None:
+    table.append(site_file("/about.html", "d", size=5, mime_type="text/plain"))
+
+    assert len(table) == 3
+    assert table["/about.html"] == site_file(
+        "/about.html", "d", size=5, mime_type="text/plain"
+    )
+    assert table.sha("/style.css") == "b" * 40
+
+
+def test_file_table_rejects_non_sha1(table: SiteFileTable) -> None:
+    with pytest.raises(ValueError):
+        table.append(site_file("/bad", "ab"))
+
+    assert "/bad" not in table
+
+
+def test_file_table_diff(table: SiteFileTable) -> None:
+    other = SiteFileTable.from_site_files([
+        site_file("/index.html", "a"),
+        site_file("/style.css", "e"),
+        site_file("/new.html", "f"),
+    ])
+
+    assert table.diff(other) == SiteFileDiff(
+        added=["/new.html"], removed=["/about.html"], changed=["/style.css"]
+    )
+    assert other.paths() - table.paths() == {"/new.html"}
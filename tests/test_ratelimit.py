@@ -0,0 +1,61 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from netlify.ratelimit import SQLiteTokenBucket
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Generator[str, None, None]:
+    yield str(tmp_path / "netlify.sqlite")
+
+
+def test_token_bucket_invalid_arguments(db_path: str) -> None:
+    with pytest.raises(ValueError):
+        SQLiteTokenBucket(db_path, rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        SQLiteTokenBucket(db_path, rate=1, capacity=0.5)
+
+
+def test_token_bucket_starts_full(db_path: str, mocker: MockerFixture) -> None:
+    mocker.patch("netlify.ratelimit.time.time", return_value=1000.0)
+    bucket = SQLiteTokenBucket(db_path, rate=1, capacity=3)
+
+    assert bucket._try_acquire() == 0
+    assert bucket._try_acquire() == 0
+    assert bucket._try_acquire() == 0
+    assert bucket._try_acquire() == pytest.approx(1.0)
+
+
+def test_token_bucket_shared_between_instances(
+    db_path: str, mocker: MockerFixture
+) -> None:
+    mocker.patch("netlify.ratelimit.time.time", return_value=1000.0)
+    first = SQLiteTokenBucket(db_path, rate=2, capacity=1)
+    second = SQLiteTokenBucket(db_path, rate=2, capacity=1)
+    other = SQLiteTokenBucket(db_path, rate=2, capacity=1, name="other")
+
+    assert first._try_acquire() == 0
+    assert second._try_acquire() == pytest.approx(0.5)
+    assert other._try_acquire() == 0
+
+
+def test_token_bucket_acquire_waits_for_refill(
+    db_path: str, mocker: MockerFixture
+) -> None:
+    clock = [1000.0]
+    mocker.patch("netlify.ratelimit.time.time", side_effect=lambda: clock[0])
+
+    def fake_sleep(seconds: float) -> None:
+        clock[0] += seconds
+
+    sleep = mocker.patch("netlify.ratelimit.time.sleep", side_effect=fake_sleep)
+    bucket = SQLiteTokenBucket(db_path, rate=4, capacity=1)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    sleep.assert_called_once_with(pytest.approx(0.25))
+    assert clock[0] == pytest.approx(1000.25)
@@ -0,0 +1,175 @@
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from netlify.enums import RequestPriority
+from netlify.exceptions import NetlifyQueueTimeoutError
+from netlify.scheduling import PriorityScheduler, current_priority, request_priority
+
+
+def start_waiter(
+    scheduler: PriorityScheduler,
+    priority: RequestPriority,
+    order: list[str],
+    name: str,
+) -> threading.Thread:
+    def run() -> None:
+        try:
+            scheduler.acquire(priority)
+        except NetlifyQueueTimeoutError:
+            order.append(f"{name}:timeout")
+        else:
+            order.append(name)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_until(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_request_priority_context() -> None:
+    assert current_priority() == RequestPriority.normal
+
+    with request_priority(RequestPriority.low):
+        assert current_priority() == RequestPriority.low
+        with request_priority(RequestPriority.high):
+            assert current_priority() == RequestPriority.high
+        assert current_priority() == RequestPriority.low
+
+    assert current_priority() == RequestPriority.normal
+
+
+def test_request_priority_thread_pool() -> None:
+    with (
+        request_priority(RequestPriority.low),
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        plain = executor.submit(current_priority).result()
+        copied = executor.submit(
+            contextvars.copy_context().run, current_priority
+        ).result()
+
+    assert plain == RequestPriority.normal
+    assert copied == RequestPriority.low
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_in_flight": 2, "reserved_high": 2},
+        {"reserved_high": -1},
+        {"normal_weight": 0},
+    ],
+)
+def test_scheduler_invalid_arguments(kwargs: dict[str, int]) -> None:
+    with pytest.raises(ValueError):
+        PriorityScheduler(**kwargs)  # type: ignore[arg-type]
+
+
+def test_scheduler_reserves_slots_for_high_priority() -> None:
+    scheduler = PriorityScheduler(max_in_flight=2, reserved_high=1)
+    order: list[str] = []
+
+    scheduler.acquire(RequestPriority.low)
+    normal = start_waiter(scheduler, RequestPriority.normal, order, "normal")
+    wait_until(lambda: scheduler.queued()[RequestPriority.normal] == 1)
+
+    scheduler.acquire(RequestPriority.high)
+    assert scheduler.in_flight() == 2
+    assert order == []
+
+    scheduler.release()
+    scheduler.release()
+    normal.join(timeout=1)
+    assert order == ["normal"]
+
+
+def test_scheduler_high_priority_goes_first() -> None:
+    scheduler = PriorityScheduler(max_in_flight=2, reserved_high=0)
+    order: list[str] = []
+    scheduler.acquire(RequestPriority.normal)
+    scheduler.acquire(RequestPriority.normal)
+
+    low = start_waiter(scheduler, RequestPriority.low, order, "low")
+    wait_until(lambda: scheduler.queued()[RequestPriority.low] == 1)
+    high = start_waiter(scheduler, RequestPriority.high, order, "high")
+    wait_until(lambda: scheduler.queued()[RequestPriority.high] == 1)
+
+    scheduler.release()
+    high.join(timeout=1)
+    assert order == ["high"]
+
+    scheduler.release()
+    low.join(timeout=1)
+    assert order == ["high", "low"]
+
+
+def test_scheduler_shares_slots_between_normal_and_low() -> None:
+    scheduler = PriorityScheduler(max_in_flight=1, reserved_high=0, normal_weight=2)
+    order: list[str] = []
+    scheduler.acquire(RequestPriority.normal)
+
+    for count, (name, priority) in enumerate(
+        [
+            ("low-1", RequestPriority.low),
+            ("low-2", RequestPriority.low),
+            ("normal-1", RequestPriority.normal),
+            ("normal-2", RequestPriority.normal),
+            ("normal-3", RequestPriority.normal),
+        ],
+        start=1,
+    ):
+        start_waiter(scheduler, priority, order, name)
+        wait_until(lambda: sum(scheduler.queued().values()) == count)  # noqa: B023
+
+    for granted in range(1, 6):
+        scheduler.release()
+        wait_until(lambda: len(order) == granted)  # noqa: B023
+
+    assert order == ["normal-1", "low-1", "normal-2", "normal-3", "low-2"]
+
+
+def test_scheduler_drops_stale_requests() -> None:
+    scheduler = PriorityScheduler(
+        max_in_flight=1,
+        reserved_high=0,
+        queue_timeouts={RequestPriority.low: 0.05, RequestPriority.normal: 0.5},
+    )
+    scheduler.acquire(RequestPriority.high)
+
+    with pytest.raises(NetlifyQueueTimeoutError):
+        scheduler.acquire(RequestPriority.low)
+
+    assert scheduler.queued()[RequestPriority.low] == 0
+
+
+def test_scheduler_expires_queued_requests_on_dispatch() -> None:
+    scheduler = PriorityScheduler(
+        max_in_flight=1,
+        reserved_high=0,
+        queue_timeouts={RequestPriority.low: 0.05},
+    )
+    order: list[str] = []
+    scheduler.acquire(RequestPriority.high)
+    low = start_waiter(scheduler, RequestPriority.low, order, "low")
+    normal = start_waiter(scheduler, RequestPriority.normal, order, "normal")
+    wait_until(lambda: sum(scheduler.queued().values()) == 2)
+
+    with scheduler._condition:
+        time.sleep(0.1)
+        scheduler._in_flight -= 1
+        scheduler._dispatch()
+
+    low.join(timeout=1)
+    normal.join(timeout=1)
+    assert sorted(order) == ["low:timeout", "normal"]
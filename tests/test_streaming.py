@@ -0,0 +1,91 @@
+import json
+from typing import Any
+
+import pytest
+
+from netlify.streaming import JSONArrayStreamParser, iter_json_array
+from tests.conftest import fixture_from_file
+
+
+def chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100_000])
+def test_iter_json_array_chunk_boundaries(size: int) -> None:
+    data = fixture_from_file("list_site_files_response.json")
+
+    assert list(iter_json_array(chunked(data, size))) == json.loads(data)
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        [],
+        [12345, -6.5e10, True, False, None],
+        ["snowman ☃", {"nested": [1, [2, {"deep": "é"}]]}],
+        ['escaped " \\ ☃ 😀', {"literals": [True, False, None]}],
+        [float("inf"), float("-inf")],
+        [{"a": 1.5, "b": [2.25e-3, -1e5]}, [[1.5], [6.02e23]], {"c": 1.5e-3}],
+    ],
+)
+@pytest.mark.parametrize("ensure_ascii", [False, True])
+def test_iter_json_array_values(document: list[Any], ensure_ascii: bool) -> None:
+    data = json.dumps(document, ensure_ascii=ensure_ascii).encode("utf-8")
+
+    assert list(iter_json_array(chunked(data, 1))) == document
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [b'[{"a": 1.', b"5}]"],
+        [b"[[1.", b"5]]"],
+        [b'[{"a": 1e', b"5}]"],
+        [b'[{"a": 1.5e-', b"3}]"],
+    ],
+)
+def test_iter_json_array_nested_number_boundaries(chunks: list[bytes]) -> None:
+    assert list(iter_json_array(chunks)) == json.loads(b"".join(chunks))
+
+
+def test_iter_json_array_yields_before_end() -> None:
+    items = iter_json_array(iter([b'[{"a": 1}, ', b'{"b"']))
+
+    assert next(items) == {"a": 1}
+    with pytest.raises(json.JSONDecodeError):
+        next(items)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[1, 2",
+        b'{"a": 1}',
+        b"[1 2]",
+        b"[1, nope]",
+        b"[1] [2]",
+    ],
+)
+def test_iter_json_array_invalid(data: bytes) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(chunked(data, 1)))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'[{"a": 1}, {"b" 2}, {"c": 3',
+        b"[1, nope, 2",
+        b"[1x, 2",
+        b'[1, "a\nb", "c',
+        b'[1, "\\x", "c',
+        b'[1, "\\u12G4", "c',
+    ],
+)
+def test_json_array_stream_parser_fails_early(data: bytes) -> None:
+    parser = JSONArrayStreamParser()
+
+    with pytest.raises(json.JSONDecodeError):
+        list(parser.feed(data))
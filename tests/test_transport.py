@@ -1,12 +1,20 @@
 import json
+import threading
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any
 
+import httpx
 import pytest
 from httpx import HTTPStatusError
 from pytest_httpx import HTTPXMock
+from pytest_mock import MockerFixture
 
+from netlify.cache import SQLiteResponseCache
+from netlify.concurrency import AdaptiveConcurrencyLimiter
+from netlify.enums import RequestPriority
 from netlify.exceptions import NetlifyError
+from netlify.scheduling import PriorityScheduler, request_priority
 from netlify.transport import NetlifyTransport
 
 
@@ -86,3 +94,398 @@ def test_transport_unhandled_error(
 
     with pytest.raises(HTTPStatusError):
         transport.send("GET", "/bad_url")
+
+
+def test_transport_cache(httpx_mock: HTTPXMock, tmp_path: Path) -> None:
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        cache=SQLiteResponseCache(str(tmp_path / "netlify.sqlite")),
+    )
+    httpx_mock.add_response(json={"id": "abc"})
+
+    assert transport.send("GET", "/sites/abc") == {"id": "abc"}
+    assert transport.send("GET", "/sites/abc") == {"id": "abc"}
+    assert len(httpx_mock.get_requests()) == 1
+
+    httpx_mock.add_response(status_code=204)
+    httpx_mock.add_response(json={"id": "abc", "name": "new"})
+
+    assert transport.send("DELETE", "/sites/abc") is None
+    assert transport.send("GET", "/sites/abc") == {"id": "abc", "name": "new"}
+    assert len(httpx_mock.get_requests()) == 3
+
+
+def test_transport_cache_invalidates_listings(
+    httpx_mock: HTTPXMock, tmp_path: Path
+) -> None:
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        cache=SQLiteResponseCache(str(tmp_path / "netlify.sqlite")),
+    )
+    httpx_mock.add_response(method="GET", json=[], is_reusable=True)
+    httpx_mock.add_response(method="POST", json={"id": "abc"}, is_reusable=True)
+
+    transport.send("GET", "/sites")
+    transport.send("GET", "/sites/abc")
+    transport.send("POST", "/sites/abc/deploys")
+    transport.send("GET", "/sites")
+    transport.send("GET", "/sites/abc")
+    transport.send("POST", "/my-team/sites")
+    transport.send("GET", "/sites")
+
+    assert [request.url.path for request in httpx_mock.get_requests()] == [
+        "/api/v1/sites",
+        "/api/v1/sites/abc",
+        "/api/v1/sites/abc/deploys",
+        "/api/v1/sites",
+        "/api/v1/sites/abc",
+        "/api/v1/my-team/sites",
+        "/api/v1/sites",
+    ]
+
+
+def test_transport_cache_skips_deploys(httpx_mock: HTTPXMock, tmp_path: Path) -> None:
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        cache=SQLiteResponseCache(str(tmp_path / "netlify.sqlite")),
+    )
+    httpx_mock.add_response(json={"id": "d1", "state": "building"})
+    httpx_mock.add_response(json={"id": "d1", "state": "ready"})
+
+    assert transport.send("GET", "/sites/abc/deploys/d1")["state"] == "building"
+    assert transport.send("GET", "/sites/abc/deploys/d1")["state"] == "ready"
+
+
+def test_transport_cache_key(transport: NetlifyTransport) -> None:
+    key = transport._build_cache_key(None, "/sites", {"page": 1})
+
+    assert key == transport._build_cache_key(
+        "https://api.netlify.com/api/v1", "/sites", {"page": 1}
+    )
+    assert key != transport._build_cache_key(None, "/sites", {"page": 2})
+    assert key != transport._build_cache_key(None, "/sites", None)
+    assert key != NetlifyTransport(
+        "other-token", "https://api.netlify.com/api/v1", "test-user-agent", 1
+    )._build_cache_key(None, "/sites", {"page": 1})
+
+
+def test_transport_rate_limiter(httpx_mock: HTTPXMock, mocker: MockerFixture) -> None:
+    rate_limiter = mocker.Mock()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        rate_limiter=rate_limiter,
+    )
+    httpx_mock.add_response(json={"id": "abc"})
+
+    transport.send("GET", "/user")
+
+    rate_limiter.acquire.assert_called_once_with()
+
+
+def test_transport_reuses_connection_pool(
+    httpx_mock: HTTPXMock, transport: NetlifyTransport
+) -> None:
+    httpx_mock.add_response(json={"id": "abc"}, is_reusable=True)
+
+    transport.send("GET", "/user")
+    httpx_client = transport._client
+    transport.send("GET", "/user")
+
+    assert httpx_client is not None
+    assert transport._client is httpx_client
+
+    transport.close()
+    transport.close()
+
+    assert httpx_client.is_closed
+    assert transport._client is None
+
+
+def test_transport_build_url(transport: NetlifyTransport) -> None:
+    assert transport._build_url(None, "/user") == "https://api.netlify.com/api/v1/user"
+    assert (
+        transport._build_url("https://test.netlify.com/", "sites")
+        == "https://test.netlify.com/sites"
+    )
+
+
+def test_transport_stream(httpx_mock: HTTPXMock, transport: NetlifyTransport) -> None:
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites?page=1",
+        json=[{"id": "abc"}, {"id": "def"}],
+    )
+
+    items = transport.stream("GET", "/sites", params={"page": 1, "per_page": None})
+
+    assert list(items) == [{"id": "abc"}, {"id": "def"}]
+
+
+def test_transport_stream_json_error(
+    httpx_mock: HTTPXMock, transport: NetlifyTransport
+) -> None:
+    httpx_mock.add_response(status_code=404, json={"code": 404, "message": "Not found"})
+
+    with pytest.raises(NetlifyError) as excinfo:
+        list(transport.stream("GET", "/bad_url"))
+
+    assert excinfo.value.code == 404
+
+
+def test_transport_stream_unhandled_error(
+    httpx_mock: HTTPXMock, mocker: MockerFixture
+) -> None:
+    rate_limiter = mocker.Mock()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        rate_limiter=rate_limiter,
+    )
+    httpx_mock.add_response(status_code=500, content=b"garbage response")
+
+    with pytest.raises(HTTPStatusError):
+        list(transport.stream("GET", "/bad_url"))
+
+    rate_limiter.acquire.assert_called_once_with()
+
+
+def test_transport_concurrency_limiter(
+    httpx_mock: HTTPXMock, mocker: MockerFixture
+) -> None:
+    limiter = mocker.Mock()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        concurrency_limiter=limiter,
+    )
+    httpx_mock.add_response(json={"id": "abc"})
+    httpx_mock.add_response(status_code=429, content=b"slow down")
+    httpx_mock.add_exception(httpx.ReadTimeout("timed out"))
+    httpx_mock.add_response(json=[{"path": "/index.html"}])
+
+    transport.send("GET", "/sites/abc")
+    with pytest.raises(HTTPStatusError):
+        transport.send("GET", "/sites/abc/files")
+    with pytest.raises(httpx.ReadTimeout):
+        transport.send("GET", "/sites/abc/deploys/def")
+    list(transport.stream("GET", "/sites/abc/files"))
+
+    assert [call.args[0] for call in limiter.acquire.call_args_list] == [
+        "sites",
+        "files",
+        "deploys",
+        "files",
+    ]
+    releases = [call.args for call in limiter.release.call_args_list]
+    assert [(family, congested) for family, _, congested in releases] == [
+        ("sites", False),
+        ("files", True),
+        ("deploys", True),
+        ("files", False),
+    ]
+    assert releases[0][1] is not None
+    assert releases[2][1] is None
+
+
+def test_transport_connection_errors_back_off(httpx_mock: HTTPXMock) -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1)
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        concurrency_limiter=limiter,
+    )
+    for _ in range(10):
+        httpx_mock.add_exception(httpx.ConnectError("connection refused"))
+
+    for _ in range(10):
+        with pytest.raises(httpx.ConnectError):
+            transport.send("GET", "/sites/abc")
+
+    metrics = limiter.metrics()["sites"]
+    assert metrics.limit == 1
+    assert metrics.throttled == 10
+
+
+def test_transport_streamed_upload_not_timed(
+    httpx_mock: HTTPXMock, mocker: MockerFixture
+) -> None:
+    limiter = mocker.Mock()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        concurrency_limiter=limiter,
+    )
+    httpx_mock.add_response(json={"id": "abc"}, is_reusable=True)
+
+    transport.send("POST", "/sites/abc/deploys", content=iter([b"PK"]))
+    transport.send("POST", "/sites/abc/deploys", content=b"PK")
+
+    latencies = [call.args[1] for call in limiter.release.call_args_list]
+    assert latencies[0] is None
+    assert latencies[1] is not None
+
+
+def test_transport_adaptive_concurrency_metrics(httpx_mock: HTTPXMock) -> None:
+    limiter = AdaptiveConcurrencyLimiter()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        concurrency_limiter=limiter,
+    )
+    httpx_mock.add_response(json={"id": "abc"})
+
+    transport.send("GET", "/user")
+
+    metrics = limiter.metrics()["default"]
+    assert metrics.requests == 1
+    assert metrics.in_flight == 0
+
+
+def test_transport_scheduler(httpx_mock: HTTPXMock, mocker: MockerFixture) -> None:
+    scheduler = mocker.Mock()
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        scheduler=scheduler,
+    )
+    httpx_mock.add_response(json={"id": "abc"}, is_reusable=True)
+    httpx_mock.add_response(url="https://api.netlify.com/api/v1/files", json=[])
+
+    transport.send("GET", "/user")
+    transport.send("GET", "/user", priority=RequestPriority.high)
+    with request_priority(RequestPriority.low):
+        transport.send("GET", "/user")
+        list(transport.stream("GET", "/files"))
+
+    assert [call.args[0] for call in scheduler.acquire.call_args_list] == [
+        RequestPriority.normal,
+        RequestPriority.high,
+        RequestPriority.low,
+        RequestPriority.low,
+    ]
+    assert scheduler.release.call_count == 4
+
+
+def test_transport_scheduler_releases_on_error(httpx_mock: HTTPXMock) -> None:
+    scheduler = PriorityScheduler(max_in_flight=1, reserved_high=0)
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        scheduler=scheduler,
+    )
+    httpx_mock.add_exception(httpx.ConnectError("unreachable"))
+
+    with pytest.raises(httpx.ConnectError):
+        transport.send("GET", "/user")
+
+    assert scheduler.in_flight() == 0
+
+
+def test_transport_stream_releases_concurrency_slot_before_body(
+    httpx_mock: HTTPXMock,
+) -> None:
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        concurrency_limiter=AdaptiveConcurrencyLimiter(initial_limit=1),
+    )
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites/s/files",
+        json=[{"path": "/a"}, {"path": "/b"}],
+    )
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites/s/files/a", json={"path": "/a"}
+    )
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites/s/files/b", json={"path": "/b"}
+    )
+    results: list[Any] = []
+
+    def consume() -> None:
+        for site_file in transport.stream("GET", "/sites/s/files"):
+            results.append(transport.send("GET", f"/sites/s/files{site_file['path']}"))
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert results == [{"path": "/a"}, {"path": "/b"}]
+
+
+def test_transport_stream_releases_scheduler_slot_before_body(
+    httpx_mock: HTTPXMock,
+) -> None:
+    scheduler = PriorityScheduler(max_in_flight=1, reserved_high=0)
+    transport = NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        scheduler=scheduler,
+    )
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites/s/files", json=[{"path": "/a"}]
+    )
+    httpx_mock.add_response(
+        url="https://api.netlify.com/api/v1/sites/s", json={"id": "s"}
+    )
+    results: list[Any] = []
+
+    def consume() -> None:
+        for _ in transport.stream("GET", "/sites/s/files"):
+            assert scheduler.in_flight() == 0
+            results.append(transport.send("GET", "/sites/s"))
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert results == [{"id": "s"}]
+
+
+def test_transport_connection_limits(mocker: MockerFixture) -> None:
+    client = mocker.patch("netlify.transport.httpx.Client", wraps=httpx.Client)
+
+    NetlifyTransport(
+        "access-token", "https://api.netlify.com/api/v1", "test-user-agent", 1
+    )._get_client()
+    NetlifyTransport(
+        "access-token",
+        "https://api.netlify.com/api/v1",
+        "test-user-agent",
+        1,
+        scheduler=PriorityScheduler(),
+    )._get_client()
+
+    limits = [call.kwargs["limits"] for call in client.call_args_list]
+    assert limits[0].max_connections == 100
+    assert limits[1].max_connections is None
@@ -0,0 +1,368 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import io
+import json
+import threading
+from collections.abc import Generator
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from netlify.client import NetlifyClient
+from netlify.exceptions import DeployWaitTimeoutError, NetlifyWebhookError
+from netlify.schemas import SiteDeploy
+from netlify.webhooks import (
+    DeployEventHub,
+    make_asgi_app,
+    make_wsgi_app,
+    parse_deploy_event,
+    verify_webhook_signature,
+)
+from tests.conftest import fixture_from_file
+
+SECRET = "webhook-secret"
+SITE_ID = "11111111-1111-1111-1111-111111111111"
+DEPLOY_ID = "abcdef0123456789"
+
+
+def b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign(
+    body: bytes,
+    secret: str = SECRET,
+    header: dict[str, Any] | None = None,
+    claims: dict[str, Any] | None = None,
+) -> str:
+    header_segment = b64url(json.dumps(header or {"alg": "HS256"}).encode())
+    claims_segment = b64url(
+        json.dumps(
+            claims or {"iss": "netlify", "sha256": hashlib.sha256(body).hexdigest()}
+        ).encode()
+    )
+    signature = hmac.new(
+        secret.encode(), f"{header_segment}.{claims_segment}".encode(), hashlib.sha256
+    ).digest()
+    return f"{header_segment}.{claims_segment}.{b64url(signature)}"
+
+
+def deploy_body(state: str = "ready", **kwargs: str) -> bytes:
+    deploy = json.loads(fixture_from_file("site_deploy_response.json"))
+    return json.dumps({**deploy, "state": state, **kwargs}).encode()
+
+
+@pytest.fixture
+def hub() -> Generator[DeployEventHub, None, None]:
+    yield DeployEventHub()
+
+
+@pytest.fixture
+def client() -> Generator[NetlifyClient, None, None]:
+    yield NetlifyClient("access-token")
+
+
+def test_verify_webhook_signature() -> None:
+    body = deploy_body()
+
+    verify_webhook_signature(body, sign(body), SECRET)
+
+
+@pytest.mark.parametrize(
+    "signature",
+    [
+        None,
+        "",
+        "not-a-jws",
+        "a.b.c",
+        sign(b"{}", header={"alg": "none"}),
+        sign(b"{}", secret="wrong-secret"),
+        sign(b"{}", claims={"iss": "someone-else"}),
+        sign(b"other body"),
+    ],
+)
+def test_verify_webhook_signature_rejects(signature: str | None) -> None:
+    with pytest.raises(NetlifyWebhookError):
+        verify_webhook_signature(b"{}", signature, SECRET)
+
+
+def test_parse_deploy_event() -> None:
+    deploy = parse_deploy_event(deploy_body("building"))
+
+    assert deploy.id == DEPLOY_ID
+    assert deploy.state == "building"
+
+
+def test_hub_publish_and_subscribe(hub: DeployEventHub) -> None:
+    received: list[SiteDeploy] = []
+    unsubscribe = hub.subscribe(received.append)
+    deploy = parse_deploy_event(deploy_body())
+
+    hub.publish(deploy)
+    unsubscribe()
+    hub.publish(deploy)
+
+    assert received == [deploy]
+    assert hub.get(DEPLOY_ID) == deploy
+    assert hub.get("unknown") is None
+
+
+def test_hub_publish_isolates_failing_subscribers(
+    hub: DeployEventHub, caplog: pytest.LogCaptureFixture
+) -> None:
+    received: list[SiteDeploy] = []
+
+    def fail(deploy: SiteDeploy) -> None:
+        raise RuntimeError("boom")
+
+    hub.subscribe(fail)
+    hub.subscribe(received.append)
+    deploy = parse_deploy_event(deploy_body())
+
+    hub.publish(deploy)
+
+    assert received == [deploy]
+    assert "Deploy subscriber failed" in caplog.text
+
+
+def test_hub_ignores_out_of_order_updates(hub: DeployEventHub) -> None:
+    received: list[SiteDeploy] = []
+    hub.subscribe(received.append)
+    building = parse_deploy_event(
+        deploy_body("building", updated_at="2024-01-01T00:00:10Z")
+    )
+    older = parse_deploy_event(
+        deploy_body("enqueued", updated_at="2024-01-01T00:00:05Z")
+    )
+    ready = parse_deploy_event(deploy_body("ready", updated_at="2024-01-01T00:00:20Z"))
+    late = parse_deploy_event(
+        deploy_body("building", updated_at="2024-01-01T00:00:30Z")
+    )
+
+    hub.publish(building)
+    hub.publish(older)
+    hub.publish(ready)
+    hub.publish(late)
+
+    assert received == [building, ready]
+    assert hub.get(DEPLOY_ID) == ready
+
+
+def test_hub_evicts_oldest_deploys() -> None:
+    hub = DeployEventHub(max_tracked=1)
+    first = parse_deploy_event(deploy_body())
+    second = parse_deploy_event(deploy_body(id="second"))
+
+    hub.publish(first)
+    hub.publish(second)
+
+    assert hub.get(DEPLOY_ID) is None
+    assert hub.get("second") == second
+
+
+def test_hub_wait_returns_known_terminal_deploy(
+    hub: DeployEventHub, client: NetlifyClient
+) -> None:
+    hub.publish(parse_deploy_event(deploy_body()))
+
+    assert hub.wait_for_deploy(client, SITE_ID, DEPLOY_ID).state == "ready"
+
+
+def test_hub_wait_woken_by_event(
+    hub: DeployEventHub, client: NetlifyClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(content=deploy_body("building"))
+    timer = threading.Timer(0.05, hub.publish, [parse_deploy_event(deploy_body())])
+    timer.start()
+
+    try:
+        deploy = hub.wait_for_deploy(
+            client, SITE_ID, DEPLOY_ID, timeout=5, quiet_period=5
+        )
+    finally:
+        timer.cancel()
+
+    assert deploy.state == "ready"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_hub_wait_polls_quiet_deploys(
+    hub: DeployEventHub, client: NetlifyClient, httpx_mock: HTTPXMock
+) -> None:
+    received: list[str] = []
+    hub.subscribe(lambda deploy: received.append(deploy.state))
+    httpx_mock.add_response(content=deploy_body("building"))
+    httpx_mock.add_response(content=deploy_body("building"))
+    httpx_mock.add_response(content=deploy_body("ready"))
+
+    deploy = hub.wait_for_deploy(
+        client, SITE_ID, DEPLOY_ID, timeout=5, quiet_period=0.01
+    )
+
+    assert deploy.state == "ready"
+    assert received == ["building", "ready"]
+
+
+def test_hub_wait_timeout(
+    hub: DeployEventHub, client: NetlifyClient, httpx_mock: HTTPXMock
+) -> None:
+    httpx_mock.add_response(content=deploy_body("building"))
+
+    with pytest.raises(DeployWaitTimeoutError) as excinfo:
+        hub.wait_for_deploy(client, SITE_ID, DEPLOY_ID, timeout=0.01, quiet_period=5)
+
+    assert "still building" in str(excinfo.value)
+
+
+def call_wsgi(
+    hub: DeployEventHub,
+    method: str,
+    body: bytes,
+    signature: str | None,
+    content_length: str | None = None,
+) -> tuple[str, bytes]:
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": method,
+        "CONTENT_LENGTH": str(len(body)) if content_length is None else content_length,
+        "wsgi.input": io.BytesIO(body),
+    }
+    if signature is not None:
+        environ["HTTP_X_WEBHOOK_SIGNATURE"] = signature
+    statuses: list[str] = []
+
+    def start_response(status: str, headers: list[tuple[str, str]]) -> None:
+        statuses.append(status)
+
+    result = b"".join(make_wsgi_app(hub, SECRET)(environ, start_response))
+    return statuses[0], result
+
+
+def test_wsgi_app(hub: DeployEventHub) -> None:
+    body = deploy_body()
+
+    assert call_wsgi(hub, "GET", b"", None) == (
+        "405 Method Not Allowed",
+        b"Method Not Allowed",
+    )
+    assert call_wsgi(hub, "POST", body, None)[0] == "401 Unauthorized"
+    assert call_wsgi(hub, "POST", b"[]", sign(b"[]"))[0] == "400 Bad Request"
+    assert hub.get(DEPLOY_ID) is None
+
+    assert call_wsgi(hub, "POST", body, sign(body)) == ("200 OK", b"OK")
+    assert hub.get(DEPLOY_ID) is not None
+
+
+def test_wsgi_app_rejects_large_body(hub: DeployEventHub) -> None:
+    body = deploy_body()
+
+    assert call_wsgi(hub, "POST", body, sign(body), str(2 * 1024 * 1024)) == (
+        "413 Content Too Large",
+        b"Content Too Large",
+    )
+    assert hub.get(DEPLOY_ID) is None
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1"])
+def test_wsgi_app_rejects_bad_content_length(
+    hub: DeployEventHub, content_length: str
+) -> None:
+    body = deploy_body()
+
+    assert call_wsgi(hub, "POST", body, sign(body), content_length) == (
+        "400 Bad Request",
+        b"Bad Request",
+    )
+    assert hub.get(DEPLOY_ID) is None
+
+
+def call_asgi(
+    hub: DeployEventHub,
+    scope: dict[str, Any],
+    events: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    sent: list[dict[str, Any]] = []
+    pending = iter(events)
+
+    async def receive() -> dict[str, Any]:
+        return next(pending)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    asyncio.run(make_asgi_app(hub, SECRET)(scope, receive, send))
+    return sent
+
+
+def test_asgi_app(hub: DeployEventHub) -> None:
+    body = deploy_body()
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"x-webhook-signature", sign(body).encode())],
+    }
+
+    sent = call_asgi(
+        hub,
+        scope,
+        [
+            {"type": "http.request", "body": body[:10], "more_body": True},
+            {"type": "http.request", "body": body[10:]},
+        ],
+    )
+
+    assert sent[0]["status"] == 200
+    assert sent[1]["body"] == b"OK"
+    assert hub.get(DEPLOY_ID) is not None
+
+
+def test_asgi_app_rejects(hub: DeployEventHub) -> None:
+    get = call_asgi(hub, {"type": "http", "method": "GET", "headers": []}, [])
+    unsigned = call_asgi(
+        hub,
+        {"type": "http", "method": "POST", "headers": []},
+        [{"type": "http.request", "body": b"{}"}],
+    )
+
+    assert get[0]["status"] == 405
+    assert unsigned[0]["status"] == 401
+
+
+def test_asgi_app_rejects_large_body(hub: DeployEventHub) -> None:
+    chunk = b"x" * (600 * 1024)
+    sent = call_asgi(
+        hub,
+        {"type": "http", "method": "POST", "headers": []},
+        [
+            {"type": "http.request", "body": chunk, "more_body": True},
+            {"type": "http.request", "body": chunk, "more_body": True},
+        ],
+    )
+
+    assert sent[0]["status"] == 413
+
+
+def test_asgi_app_lifespan(hub: DeployEventHub) -> None:
+    sent = call_asgi(
+        hub,
+        {"type": "lifespan"},
+        [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}],
+    )
+
+    assert [message["type"] for message in sent] == [
+        "lifespan.startup.complete",
+        "lifespan.shutdown.complete",
+    ]
+
+
+def test_asgi_app_websocket(hub: DeployEventHub) -> None:
+    sent = call_asgi(hub, {"type": "websocket"}, [{"type": "websocket.connect"}])
+
+    assert sent == [{"type": "websocket.close"}]
+
+
+def test_asgi_app_unsupported_scope(hub: DeployEventHub) -> None:
+    with pytest.raises(ValueError, match="Unsupported ASGI scope type"):
+        call_asgi(hub, {"type": "other"}, [])